@@ -0,0 +1,201 @@
+"""Prebaked asset pack.
+
+`python asset_pack.py` builds every screen once headlessly and writes each
+sprite it loaded, already scaled to its final size, into a single pack
+file (assets/assets.pack). AssetLoader memory-maps the pack at startup and
+builds surfaces straight from it, skipping PNG decoding and rescaling.
+Opaque sprites are stored without an alpha channel.
+
+The bake also rebuilds the minigame's hit masks (assets/hit_masks.npz,
+see hit_masks.py) from the sprites.
+
+Re-run the bake after changing anything in assets/ or a sprite size. The
+bake matches one render scale, BST_RENDER_SCALE (default 1): set it to
+the value the game runs with, or sprite lookups miss the pack.
+
+Pack layout:
+    MAGIC | uint32 index length | JSON index | pixel data
+Index entries map a pack key to the offset, length, size and pixel
+format of a raw pixel blob. Offsets are relative to the start of the
+pixel data.
+"""
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+from hit_masks import HitMasks, default_hit_masks_path
+
+
+MAGIC = b"BSTPACK1"
+PACK_FILENAME = "assets.pack"
+_HEADER = struct.Struct("<8sI")
+_ALIGN = 16  # Keep every pixel blob 16-byte aligned
+_BYTES_PER_PIXEL = {"RGB": 3, "RGBA": 4}
+
+
+def pack_key(cache_key):
+    """Return the pack index key for an AssetLoader cache key"""
+    filename, size, scale_factor = cache_key
+    size_text = f"{size[0]}x{size[1]}" if size else "original"
+    return f"{filename}|{size_text}|{float(scale_factor)}"
+
+
+def default_pack_path(base_path):
+    return os.path.join(base_path, "assets", PACK_FILENAME)
+
+
+class AssetPack:
+    """Read-only, memory-mapped view of a baked asset pack"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as pack_file:
+            self._mmap = mmap.mmap(
+                pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{path} is too short for an asset pack")
+        magic, index_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an asset pack")
+        index_start = _HEADER.size
+        self.data_start = index_start + index_length
+        if self.data_start > len(self._mmap):
+            raise ValueError(f"{path} is truncated in its index")
+        self.index = json.loads(self._mmap[index_start:self.data_start])
+        # Check every blob up front, so a truncated or corrupt pack is
+        # rejected as a whole instead of failing at some later load
+        data_length = len(self._mmap) - self.data_start
+        for key, entry in self.index.items():
+            try:
+                width, height = entry['size']
+                expected = width * height * _BYTES_PER_PIXEL[entry['format']]
+                valid = (entry['length'] == expected and entry['offset'] >= 0
+                         and entry['offset'] + expected <= data_length)
+            except (KeyError, TypeError, ValueError):
+                valid = False
+            if not valid:
+                raise ValueError(f"{path} has a bad entry for {key}")
+
+    def __contains__(self, cache_key):
+        return pack_key(cache_key) in self.index
+
+    def load(self, cache_key):
+        """Build a surface for a cache key, or return None if not baked"""
+        entry = self.index.get(pack_key(cache_key))
+        if entry is None:
+            return None
+        start = self.data_start + entry['offset']
+        pixels = memoryview(self._mmap)[start:start + entry['length']]
+        return pygame.image.frombuffer(
+            pixels, tuple(entry['size']), entry['format'])
+
+
+def write_pack(path, surfaces):
+    """Write {cache_key: surface} into a pack file at `path`"""
+    index = {}
+    blobs = []
+    offset = 0
+    for cache_key, surface in surfaces.items():
+        # Opaque sprites need no alpha channel (see utils.blit_ready)
+        if surface.get_flags() & pygame.SRCALPHA:
+            pixel_format = "RGBA"
+        else:
+            pixel_format = "RGB"
+        pixels = pygame.image.tobytes(surface, pixel_format)
+        index[pack_key(cache_key)] = {
+            'offset': offset,
+            'length': len(pixels),
+            'size': list(surface.get_size()),
+            'format': pixel_format,
+        }
+        padding = -len(pixels) % _ALIGN
+        blobs.append(pixels + bytes(padding))
+        offset += len(pixels) + padding
+
+    index_bytes = json.dumps(index, sort_keys=True).encode("utf-8")
+    # Pad the index so the pixel data also starts aligned
+    index_bytes += b" " * (-(_HEADER.size + len(index_bytes)) % _ALIGN)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as pack_file:
+        pack_file.write(_HEADER.pack(MAGIC, len(index_bytes)))
+        pack_file.write(index_bytes)
+        for blob in blobs:
+            pack_file.write(blob)
+    os.replace(tmp_path, path)
+    return index
+
+
+def sprite_hit_masks(asset_loader):
+    """Build the minigame's HitMasks from its sprites at layout size"""
+    from game import MinigameRenderer
+    from obstacles import OBSTACLE_TYPES
+
+    # None of these sprites is full-screen, so no screen size is needed
+    specs = MinigameRenderer.sprite_specs(None, None)
+
+    def mask_array(name):
+        mask = asset_loader.load_mask(*specs[name])
+        surface = mask.to_surface(setcolor=(255, 255, 255),
+                                  unsetcolor=(0, 0, 0))
+        # surfarray is indexed [x, y]; masks are [y, x]
+        return pygame.surfarray.array_red(surface).T > 0
+
+    return HitMasks(mask_array('robot'), mask_array('ied'),
+                    [mask_array(name) for name in OBSTACLE_TYPES])
+
+
+def bake(base_path, width=1024, height=768, path=None, scale=1.0,
+         hit_masks_path=None):
+    """Load every screen's sprites headlessly and write them to the pack.
+
+    Sprites are baked at the sizes used at render `scale` (see
+    BST_RENDER_SCALE). The pack goes to `path`, or assets/assets.pack by
+    default. The minigame's hit masks are rebuilt too, into
+    `hit_masks_path` or assets/hit_masks.npz.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    # Imported here because utils imports this module
+    from utils import AssetLoader, FontManager
+    from screens import MenuScreen, TravelScreen, MinigameScreen, \
+        OutcomeScreen
+    from game import MinigameRenderer
+
+    asset_loader = AssetLoader(base_path, use_pack=False)
+    font_manager = FontManager(base_path)
+    for screen_class in (MenuScreen, TravelScreen, MinigameScreen,
+                         OutcomeScreen):
+        screen_class(width, height, asset_loader, font_manager, None,
+                     scale=scale)
+    # The minigame screen only loads its sprites on the first round
+    asset_loader.warm_sprites(MinigameRenderer.sprite_specs(
+        round(width * scale), round(height * scale), scale))
+
+    surfaces = {
+        key: surface
+        for key, surface in asset_loader.cached_images.items()
+        if surface is not None
+    }
+    path = path or default_pack_path(base_path)
+    index = write_pack(path, surfaces)
+    print(f"Baked {len(index)} sprites into {path} "
+          f"({os.path.getsize(path) // 1024} KiB)")
+
+    # After the pack is written: hit masks are always taken from the
+    # sprites at layout size, whatever the render scale
+    hit_masks_path = hit_masks_path or default_hit_masks_path(base_path)
+    sprite_hit_masks(asset_loader).save(hit_masks_path)
+    print(f"Wrote hit masks to {hit_masks_path}")
+    return path
+
+
+if __name__ == "__main__":
+    bake(os.path.dirname(os.path.abspath(__file__)),
+         scale=float(os.environ.get("BST_RENDER_SCALE", 1)))
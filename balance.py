@@ -0,0 +1,265 @@
+"""Monte Carlo balancing harness for the IED minigame.
+
+Plays scripted bot policies against MinigameSim over a grid of tuning
+parameters, spread across a multiprocessing pool, and reports the win
+rate plus time-to-find and battery-left distributions for each grid
+point. For example:
+
+    python balance.py --rounds 100000 --battery-drain 0.1 0.125 0.15 \\
+        --spawn-chance 30 40 50 --policy seek dodge --json results.json
+
+Each chunk of rounds gets its own RNG stream spawned from one
+numpy.random.SeedSequence, so results depend only on --seed, never on the
+number of workers.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import random
+import sys
+import time
+
+import numpy as np
+
+import gamelog
+from minigame_sim import MinigameSim
+
+
+WIDTH, HEIGHT = 1024, 768
+PERCENTILES = (10, 25, 50, 75, 90)
+# Steps a round may last before it counts as a loss (the default battery
+# lasts 800)
+MAX_STEPS = 20000
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+class SeekBot:
+    """Heads straight for the IED"""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def act(self, sim):
+        """Return this step's (dx, dy) move"""
+        # Line the IED up with the centre of the player's sprite
+        bounds_x, bounds_y, width, height = sim.hit_masks.player_bounds
+        ied_width, ied_height = sim.hit_masks.ied_size
+        return (sign(sim.ied_pos[0] - sim.player_pos[0] - bounds_x
+                     - (width - ied_width) // 2),
+                sign(sim.ied_pos[1] - sim.player_pos[1] - bounds_y
+                     - (height - ied_height) // 2))
+
+
+class DodgeBot(SeekBot):
+    """Heads for the IED, but never moves into an obstacle's path"""
+
+    def act(self, sim):
+        dx, dy = super().act(sim)
+        bounds_x, bounds_y, width, height = sim.hit_masks.player_bounds
+        x = sim.player_pos[0] + bounds_x
+        y = sim.player_pos[1] + bounds_y
+        speed = sim.MOVE_SPEED
+        # Where obstacles could be by the end of the step
+        reach = 2 * sim.FALL_SPEED
+        for move_x, move_y in ((dx, dy), (dx, 0), (0, dy), (0, 0),
+                               (-1, 0), (1, 0)):
+            hit = sim.obstacles.first_hit(
+                x + move_x * speed, y + move_y * speed - reach,
+                width, height + reach, sim.hit_masks.obstacle_size)
+            if hit < 0:
+                return move_x, move_y
+        return dx, dy
+
+
+class WanderBot(SeekBot):
+    """Random walk, changing direction now and then"""
+
+    TURN_CHANCE = 0.05
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.direction = (0, 0)
+
+    def act(self, sim):
+        if self.direction == (0, 0) or self.rng.random() < self.TURN_CHANCE:
+            self.direction = (self.rng.choice((-1, 0, 1)),
+                              self.rng.choice((-1, 0, 1)))
+        return self.direction
+
+
+POLICIES = {
+    'seek': SeekBot,
+    'dodge': DodgeBot,
+    'wander': WanderBot,
+}
+
+
+def play_round(sim, bot):
+    """Play one round to the end; return (found IED, steps, battery left)"""
+    sim.reset_game()
+    steps = 0
+    while not sim.game_over and steps < MAX_STEPS:
+        sim.begin_step()
+        dx, dy = bot.act(sim)
+        if dx or dy:
+            sim.move_player(dx, dy)
+        sim.update()
+        steps += 1
+    return sim.success, steps, max(0.0, sim.battery)
+
+
+def run_chunk(task):
+    """Worker: play `rounds` rounds of one grid point with its own stream"""
+    tuning, policy_name, rounds, seed_sequence = task
+    seed = int(seed_sequence.generate_state(2, np.uint64)[0])
+    sim_rng = random.Random(seed)
+    policy_rng = random.Random(seed ^ 0x5EED)
+    sim = MinigameSim(WIDTH, HEIGHT, rng=sim_rng, tuning=tuning)
+    bot_class = POLICIES[policy_name]
+
+    success = np.empty(rounds, dtype=np.bool_)
+    steps = np.empty(rounds, dtype=np.uint32)
+    battery = np.empty(rounds, dtype=np.float32)
+    for i in range(rounds):
+        success[i], steps[i], battery[i] = play_round(
+            sim, bot_class(policy_rng))
+    return success, steps, battery
+
+
+def quiet_worker():
+    """Pool initializer: per-round logging would dominate the run time"""
+    gamelog.set_category_level("minigame", gamelog.OFF)
+
+
+def distribution(values):
+    """Return percentiles, mean and a histogram of `values`"""
+    if not len(values):
+        return None
+    counts, edges = np.histogram(values, bins=20)
+    return {
+        'mean': float(values.mean()),
+        'percentiles': {
+            f"p{p}": float(v)
+            for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+        },
+        'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()},
+    }
+
+
+def summarize(success, steps, battery):
+    """Summarize one grid point's rounds; times are in seconds"""
+    seconds = steps / MinigameSim.STEP_HZ
+    return {
+        'rounds': int(len(success)),
+        'win_rate': float(success.mean()),
+        'time_to_find_s': distribution(seconds[success]),
+        'round_length_s': distribution(seconds),
+        'battery_left': distribution(battery[success]),
+    }
+
+
+def sweep(grid, policies, rounds, seed=0, workers=None, chunk_size=2000):
+    """Play `rounds` rounds for every tuning in `grid` and policy.
+
+    `grid` is a list of MinigameSim tuning dicts. Returns a list of
+    (tuning, policy name, summary) tuples.
+    """
+    points = list(itertools.product(range(len(grid)), policies))
+    chunks_per_point = -(-rounds // chunk_size)
+    seed_sequences = iter(np.random.SeedSequence(seed).spawn(
+        len(points) * chunks_per_point))
+
+    tasks = []
+    owners = []
+    for point, (grid_index, policy_name) in enumerate(points):
+        remaining = rounds
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            tasks.append((grid[grid_index], policy_name, size,
+                          next(seed_sequences)))
+            owners.append(point)
+            remaining -= size
+
+    parts = [[] for _ in points]
+    with multiprocessing.Pool(workers, initializer=quiet_worker) as pool:
+        for point, result in zip(owners, pool.imap(run_chunk, tasks)):
+            parts[point].append(result)
+
+    results = []
+    for (grid_index, policy_name), point_parts in zip(points, parts):
+        success, steps, battery = (
+            np.concatenate(column) for column in zip(*point_parts))
+        results.append((grid[grid_index], policy_name,
+                        summarize(success, steps, battery)))
+    return results
+
+
+def format_results(results):
+    lines = [f"{'policy':<7} {'tuning':<58} {'win':>6} {'find p50':>9} "
+             f"{'find p90':>9} {'batt p50':>9}"]
+    for tuning, policy_name, summary in results:
+        find = summary['time_to_find_s']
+        battery = summary['battery_left']
+        tuning_text = " ".join(f"{k}={v}" for k, v in tuning.items())
+        lines.append(
+            f"{policy_name:<7} {tuning_text:<58} {summary['win_rate']:6.1%} "
+            + (f"{find['percentiles']['p50']:8.2f}s "
+               f"{find['percentiles']['p90']:8.2f}s "
+               f"{battery['percentiles']['p50']:9.1f}"
+               if find else f"{'-':>9} {'-':>9} {'-':>9}")
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Sweep minigame parameters with scripted bots")
+    parser.add_argument("--rounds", type=int, default=10000,
+                        help="rounds per grid point and policy")
+    parser.add_argument("--policy", nargs="+", default=["seek", "dodge"],
+                        choices=sorted(POLICIES))
+    parser.add_argument("--battery-drain", nargs="+", type=float,
+                        default=[0.125])
+    parser.add_argument("--move-speed", nargs="+", type=int, default=[12])
+    parser.add_argument("--spawn-chance", nargs="+", type=int,
+                        default=[40])
+    parser.add_argument("--min-distance", nargs="+", type=int,
+                        default=[200])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="pool size (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--json", help="write full distributions here")
+    args = parser.parse_args(argv)
+
+    grid = [
+        {'BATTERY_DRAIN': drain, 'MOVE_SPEED': speed,
+         'spawn_chance': chance, 'IED_MIN_DISTANCE': distance}
+        for drain, speed, chance, distance in itertools.product(
+            args.battery_drain, args.move_speed, args.spawn_chance,
+            args.min_distance)
+    ]
+    total = len(grid) * len(args.policy) * args.rounds
+    start = time.perf_counter()
+    results = sweep(grid, args.policy, args.rounds, args.seed, args.workers,
+                    args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    print(format_results(results))
+    print(f"{total} rounds in {elapsed:.1f}s "
+          f"({total / elapsed:.0f} rounds/s)")
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump([
+                {'tuning': tuning, 'policy': policy_name, **summary}
+                for tuning, policy_name, summary in results
+            ], json_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+"""Headless benchmark suite.
+
+`python benchmark.py` runs every screen's update/draw and the minigame
+simulation at several obstacle counts and on the 'stress' difficulty
+preset under SDL's dummy video and audio drivers, uncapped, for a fixed
+number of frames. Each case reports frames/sec, p95 frame time and the
+bytes allocated per frame (peak traced by tracemalloc over a separate,
+shorter pass).
+
+`--render-scale 0.5` draws the screens at half resolution and upscales
+each frame to the display, as BST_RENDER_SCALE does in game; those
+cases are named with an "@0.5" suffix.
+
+`--save` stores the results as the baseline (benchmark_baseline.json);
+later runs are compared against it and any case that got slower or
+allocates more by more than the threshold is flagged, with exit status 1.
+The baseline is machine specific, so save one on the machine you compare
+on.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from profiler import PhaseStats  # noqa: E402
+from utils import present_scaled  # noqa: E402
+
+
+WIDTH, HEIGHT = 1024, 768
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILENAME = "benchmark_baseline.json"
+OBSTACLE_COUNTS = (0, 100, 1000, 5000)
+GAME_DATA = {
+    'points': 42,
+    'lives': 3,
+    'battery': 100,
+    'fuel': 100,
+    'morale': 100,
+}
+
+
+def keep_round_alive(sim, obstacle_count):
+    """Undo anything that would end a benchmark round early.
+
+    Random spawning is replaced by topping the field up to
+    `obstacle_count` each frame, so the count holds steady.
+    """
+    sim.game_over = False
+    sim.battery = 100
+    while len(sim.obstacles) < obstacle_count:
+        sim.spawn_obstacle()
+
+
+def fill_obstacles(sim, obstacle_count):
+    """Spread `obstacle_count` obstacles evenly down the screen"""
+    sim.spawn_chance = sys.maxsize  # Only keep_round_alive() spawns
+    size = sim.OBSTACLE_SIZE
+    # Bottom first, so the field's fall keys stay sorted
+    for i in range(obstacle_count):
+        y = sim.height - (sim.height + size) * (i + 1) / obstacle_count
+        sim.obstacles.spawn(
+            sim.rng.randint(0, sim.width - size), y)
+
+
+def minigame_sim_case(obstacle_count):
+    """IEDMiniGame.update with the field held at obstacle_count"""
+    from game import IEDMiniGame
+
+    def setup(display, target, loaders):
+        game = IEDMiniGame(
+            WIDTH, HEIGHT, rng=random.Random(1),
+            renderer=loaders['minigame'].renderer)
+        fill_obstacles(game, obstacle_count)
+
+        def frame():
+            game.update()
+            keep_round_alive(game, obstacle_count)
+        return frame
+    return setup
+
+
+def stress_case():
+    """IEDMiniGame.update on the 'stress' preset, once its field is full"""
+    from game import IEDMiniGame
+
+    def setup(display, target, loaders):
+        game = IEDMiniGame(
+            WIDTH, HEIGHT, rng=random.Random(1), difficulty='stress',
+            renderer=loaders['minigame'].renderer)
+        # Spawning and obstacles falling off the bottom even out once the
+        # first obstacles have crossed the screen
+        for _ in range(int((HEIGHT + game.OBSTACLE_SIZE) / game.FALL_SPEED)
+                       + 1):
+            game.update()
+            keep_round_alive(game, 0)
+
+        def frame():
+            game.update()
+            keep_round_alive(game, 0)
+        return frame
+    return setup
+
+
+def screen_case(state_name, dirty, obstacle_count=100):
+    """Update and draw one screen, fully or with dirty rects"""
+    def setup(display, target, loaders):
+        current = loaders[state_name]
+        if state_name == 'minigame':
+            current.init_game(100, 3)
+            current.ied_game.rng.seed(1)
+            fill_obstacles(current.ied_game, obstacle_count)
+        current.dirty.reset()
+        update = getattr(current, 'update', None)
+        game = current.ied_game if state_name == 'minigame' else None
+
+        def frame():
+            if update is not None:
+                update()
+            if game is not None:
+                keep_round_alive(game, obstacle_count)
+            if dirty:
+                rects = current.draw_dirty(target, GAME_DATA)
+                if target is not display:
+                    rects = present_scaled(target, display, rects)
+                if rects:
+                    pygame.display.update(rects)
+            else:
+                current.draw(target, GAME_DATA)
+                if target is not display:
+                    present_scaled(target, display)
+                pygame.display.flip()
+        return frame
+    return setup
+
+
+def build_cases():
+    """Return {case name: setup(display, target, loaders) -> frame}"""
+    cases = {}
+    for state_name in ('menu', 'travel', 'minigame', 'outcome'):
+        cases[f"{state_name}.draw"] = screen_case(state_name, False)
+        cases[f"{state_name}.draw_dirty"] = screen_case(state_name, True)
+    for count in OBSTACLE_COUNTS[2:]:
+        cases[f"minigame.draw[{count}]"] = screen_case(
+            'minigame', False, count)
+    for count in OBSTACLE_COUNTS:
+        cases[f"sim.update[{count}]"] = minigame_sim_case(count)
+    cases["sim.update[stress]"] = stress_case()
+    return cases
+
+
+def build_screens(scale=1.0):
+    """Set up pygame headlessly and build one of each screen.
+
+    Returns the display, the target surface the screens draw into (the
+    display itself unless `scale` is below 1) and the screens.
+    """
+    from utils import AssetLoader, FontManager
+    from screens import (
+        MenuScreen, TravelScreen, MinigameScreen, OutcomeScreen,
+    )
+
+    pygame.init()
+    display = pygame.display.set_mode((WIDTH, HEIGHT))
+    target = display
+    if scale != 1:
+        target = pygame.Surface(
+            (round(WIDTH * scale), round(HEIGHT * scale))).convert()
+    asset_loader = AssetLoader(BASE_PATH)
+    font_manager = FontManager(BASE_PATH, scale)
+    args = (WIDTH, HEIGHT, asset_loader, font_manager, None)
+    screens = {
+        'menu': MenuScreen(*args, scale=scale),
+        'travel': TravelScreen(*args, scale=scale),
+        'minigame': MinigameScreen(*args, scale=scale),
+        'outcome': OutcomeScreen(*args, scale=scale),
+    }
+    # Build the shared minigame renderer up front
+    screens['minigame'].init_game(100, 3)
+    return display, target, screens
+
+
+def run_case(frame, frames, alloc_frames):
+    """Time `frames` calls of frame(), then trace allocations"""
+    for _ in range(min(frames, 30)):  # Warm caches
+        frame()
+
+    stats = PhaseStats(frames)
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(frames):
+        frame_start = clock()
+        frame()
+        stats.add(clock() - frame_start)
+    elapsed_ns = clock() - start
+
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(alloc_frames):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        frame()
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    summary = stats.summary()
+    return {
+        'fps': frames / (elapsed_ns / 1e9),
+        'p95_ms': summary['p95'],
+        'alloc_bytes': allocated / alloc_frames if alloc_frames else 0,
+    }
+
+
+def run(frames=600, alloc_frames=60, only=None, scale=1.0):
+    """Run every benchmark case (or those named in `only`)"""
+    display, target, screens = build_screens(scale)
+    suffix = f"@{scale:g}" if scale != 1 else ""
+    results = {}
+    for name, setup in build_cases().items():
+        if only and name not in only:
+            continue
+        results[name + suffix] = run_case(
+            setup(display, target, screens), frames, alloc_frames)
+    return results
+
+
+def find_regressions(results, baseline, threshold=0.15, alloc_slack=1024):
+    """Return a message for each case worse than baseline by `threshold`.
+
+    Allocation growth smaller than `alloc_slack` bytes is ignored, since
+    tiny per-frame allocations are noisy.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['fps'] < base['fps'] * (1 - threshold):
+            regressions.append(
+                f"{name}: {result['fps']:.0f} fps, baseline "
+                f"{base['fps']:.0f} fps"
+            )
+        alloc_limit = max(base['alloc_bytes'] * (1 + threshold),
+                          base['alloc_bytes'] + alloc_slack)
+        if result['alloc_bytes'] > alloc_limit:
+            regressions.append(
+                f"{name}: {result['alloc_bytes']:.0f} B/frame, baseline "
+                f"{base['alloc_bytes']:.0f} B/frame"
+            )
+    return regressions
+
+
+def format_results(results, baseline=None):
+    baseline = baseline or {}
+    lines = [f"{'case':<22} {'fps':>9} {'p95 ms':>8} {'B/frame':>10} "
+             f"{'vs base':>8}"]
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = (f"{result['fps'] / base['fps'] - 1:+.0%}"
+                  if base else "")
+        lines.append(
+            f"{name:<22} {result['fps']:9.0f} {result['p95_ms']:8.2f} "
+            f"{result['alloc_bytes']:10.0f} {change:>8}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600,
+                        help="timed frames per case")
+    parser.add_argument("--alloc-frames", type=int, default=60,
+                        help="frames traced for allocations per case")
+    parser.add_argument("--baseline",
+                        default=os.path.join(BASE_PATH, BASELINE_FILENAME))
+    parser.add_argument("--save", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed slowdown/allocation growth (0.15 = "
+                             "15%%)")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="internal render resolution, as a fraction "
+                             "of the display's")
+    parser.add_argument("cases", nargs="*", help="only run these cases")
+    args = parser.parse_args(argv)
+
+    results = run(args.frames, args.alloc_frames, args.cases,
+                  args.render_scale)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    print(format_results(results, baseline))
+
+    if args.save:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(dict(baseline, **results), baseline_file, indent=2,
+                      sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import pygame
+
+
+class DirtyRectTracker:
+    """Tracks the regions a screen draws moving things into.
+
+    Each screen keeps a static layer (its background plus anything that
+    does not change from frame to frame). At the start of a frame the
+    regions drawn last frame are restored from that layer, and at the end
+    both the old and new regions are returned for display.update().
+    """
+
+    # Past this many regions one full-screen update is cheaper
+    MAX_RECTS = 64
+
+    def __init__(self, width, height):
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+        self.static_layer = None
+        self.static_key = None
+        self.previous = []
+        self.current = []
+        self.full = False
+
+    def needs_static(self, key=None):
+        """Return True if the static layer is missing or out of date"""
+        return self.static_layer is None or key != self.static_key
+
+    def build_static(self, surface, draw_static, key=None):
+        """Render a new static layer matching `surface`'s pixel format"""
+        layer = pygame.Surface(surface.get_size(), 0, surface)
+        draw_static(layer)
+        self.static_layer = layer
+        self.static_key = key
+
+    def begin(self, surface, full=False):
+        """Erase last frame's moving things, or redraw the whole layer"""
+        self.full = full
+        if full:
+            surface.blit(self.static_layer, (0, 0))
+            self.previous = []
+        else:
+            static_layer = self.static_layer
+            for rect in self.previous:
+                surface.blit(static_layer, rect, rect)
+
+    def add(self, rect):
+        """Record a region drawn this frame"""
+        self.current.append(rect)
+
+    def extend(self, rects):
+        self.current.extend(rects)
+
+    def end(self):
+        """Finish the frame and return the rects to push to the display"""
+        rects = self.previous + self.current
+        self.previous = self.current
+        self.current = []
+        if self.full or len(rects) > self.MAX_RECTS:
+            return [self.screen_rect]
+        return rects
+
+    def reset(self):
+        """Forget the static layer so the next frame is a full redraw"""
+        self.static_layer = None
+        self.static_key = None
+        self.previous = []
+        self.current = []
@@ -1,6 +1,14 @@
+import itertools
 import random
 import pygame
 import os
+import numpy as np
+from minigame_sim import MinigameSim
+from utils import AssetLoader, FontManager, text_cache
+from gamelog import get_logger
+
+
+log = get_logger("minigame.render")
 
 
 class Event:
@@ -43,386 +51,350 @@ class GameEvents:
         return outcomes
 
 
-class IEDMiniGame:
-    def __init__(
-        self,
-        screen_width,
-        screen_height,
-        initial_battery=100,
-        lives=3,
-        operator_mode=False,
-        points=0,
-    ):
-        self.width = screen_width
-        self.height = screen_height
-        self.player_pos = [(screen_width // 2) - 60, (screen_height // 2) - 60]
-        self.battery = initial_battery
-        self.lives = lives
-        self.game_over = False
-        self.success = False
-        self.operator_mode = operator_mode
-        self.points = points
-
-        # Define movement speed
-        self.MOVE_SPEED = 12  # Adjust this value as needed
-
-        # Define battery drain rate
-        self.BATTERY_DRAIN = 0.125  # Adjust this value as needed
-
-        # Initialize IED position
-        self.ied_pos = None
-        self.place_ied()  # Place the IED on the grid
-
-        # Initialize obstacles list
-        self.obstacles = []  # List to store falling obstacles
+class MinigameRenderer:
+    """Draws a MinigameSim.
+
+    Owns the sprites and fonts for the minigame so the simulation itself
+    never touches pygame. Sprites come from the shared AssetLoader cache,
+    so building a renderer after the first one does no disk I/O.
+
+    `width` and `height` are the render resolution; with a render
+    `scale` below 1, sprites are loaded pre-scaled by it and sim
+    positions are scaled to match when drawn.
+    """
+
+    # name -> (file, fallback color, base size, scale factor).
+    # Full-screen sizes are filled in from the screen size.
+    SPRITES = {
+        'robot': ("talon_sprite.png", (0, 0, 255), (120, 120), 1.3),
+        'ied': ("9v_battery.png", (255, 0, 0), (40, 40), 1.3),
+        'tnt': ("tnt_boom.png", (255, 0, 0), (50, 50), 1.3),
+        'doge': ("doge_em.png", (255, 255, 0), (50, 50), 1.3),
+        'life': ("hair_gel.png", (255, 255, 0), (60, 60), 1.3),
+        'gameover': ("game_over.png", (0, 0, 0), None, 1),
+        'celebration': (
+            "celebration_background.png", (0, 255, 0), None, 1),
+        'background': ("IED_mini_background.png", (30, 30, 60), None, 1),
+    }
+
+    def __init__(self, width, height, asset_loader=None, font_manager=None,
+                 scale=1.0):
+        self.width = width
+        self.height = height
+        self.scale = scale
+        if asset_loader is None:
+            asset_loader = AssetLoader(os.path.dirname(__file__))
+        self.asset_loader = asset_loader
+        if font_manager is None:
+            font_manager = FontManager(os.path.dirname(__file__))
 
         # Load fonts
-        self.game_over_font = pygame.font.SysFont("consolas", 48)
-        self.game_over_small_font = pygame.font.SysFont(
-            "consolas", 24)  # Define small font for resource bars
+        self.game_over_font = font_manager.font(48)
+        # Small font for resource bars
+        self.game_over_small_font = font_manager.font(24)
 
         # Load sprites with 30% scaling
-        sprite_path = os.path.join(os.path.dirname(__file__), "assets")
-        self.robot_sprite = self.load_sprite(os.path.join(
-            sprite_path, "talon_sprite.png"), (0, 0, 255), (120, 120))
-        self.ied_sprite = self.load_sprite(os.path.join(
-            sprite_path, "9v_battery.png"), (255, 0, 0), (40, 40))
-        self.tnt_sprite = self.load_sprite(os.path.join(
-            sprite_path, "tnt_boom.png"), (255, 0, 0), (50, 50))
-        self.doge_sprite = self.load_sprite(os.path.join(
-            sprite_path, "doge_em.png"), (255, 255, 0), (50, 50))
-        self.gameover_image = self.load_sprite(
-            os.path.join(sprite_path, "game_over.png"),
-            (0, 0, 0),
-            (self.width, self.height),
-            scale_factor=1,
-        )
-        self.life_sprite = self.load_sprite(os.path.join(
-            sprite_path, "hair_gel.png"), (255, 255, 0), (60, 60))
-        self.celebration_background = self.load_sprite(
-            os.path.join(sprite_path, "celebration_background.png"),
-            (0, 255, 0),
-            (self.width, self.height),
-        )  # Add celebration background
-        # Add the new background
-        self.minigame_background = self.load_sprite(
-            os.path.join(sprite_path, "IED_mini_background.png"),
-            (30, 30, 60),
-            (self.width, self.height),
-            scale_factor=1,
-        )
-        print(f"IED Minigame started with {self.lives} lives")
-
-    def load_sprite(self, sprite_path, fallback_color, size, scale_factor=1.3):
-        """Load and scale a sprite with a fallback color"""
-        try:
-            sprite = pygame.image.load(sprite_path).convert_alpha()
-            scaled_size = (int(size[0] * scale_factor),
-                           int(size[1] * scale_factor))
-            return pygame.transform.scale(sprite, scaled_size)
-        except FileNotFoundError:
-            print(f"Warning: Missing sprite file at {sprite_path}")
-            sprite = pygame.Surface(size)
-            sprite.fill(fallback_color)
-            return sprite
-
-    def switch_sprite(self):
-        """Switch between robot and bomb suit sprites"""
-        if self.current_sprite == "robot":
-            self.current_sprite = "bombsuit"
-            print("Switched to Bomb Suit - Watch your morale!")
-        else:
-            self.current_sprite = "robot"
-            print("Switched to Talon Robot - Watch your battery!")
-
-    def draw(self, screen):
+        sprites = asset_loader.warm_sprites(
+            self.sprite_specs(width, height, scale))
+        self.robot_sprite = sprites['robot']
+        self.ied_sprite = sprites['ied']
+        self.tnt_sprite = sprites['tnt']
+        self.doge_sprite = sprites['doge']
+        self.gameover_image = sprites['gameover']
+        self.life_sprite = sprites['life']
+        self.celebration_background = sprites['celebration']
+        self.minigame_background = sprites['background']
+        # Indexed by the obstacle kind values in obstacles.OBSTACLE_TYPES;
+        # an object array so a whole field's sprites are one lookup
+        self.obstacle_sprites = np.array(
+            [self.tnt_sprite, self.doge_sprite], dtype=object)
+        # Life sprite blit sequences, by lives shown, for the HUD and for
+        # the transition page
+        self.hud_lives = {}
+        self.transition_lives = {}
+        # Detector lamp colours by closeness to the IED (0-255), from dark
+        # red far away to yellow on top of it, lit and between beeps
+        self.lamp_lit = [(80 + 175 * level // 255,
+                          max(0, 2 * level - 255), 0)
+                         for level in range(256)]
+        self.lamp_dim = [(r // 3, g // 3, b) for r, g, b in self.lamp_lit]
+        # How far between the last two sim steps to draw moving sprites
+        self.alpha = 1.0
+
+    @classmethod
+    def sprite_specs(cls, width, height, scale=1.0):
+        """Return SPRITES as AssetLoader.load_sprite argument tuples.
+
+        Base sizes are multiplied by the render `scale`.
+        """
+        return {
+            name: (filename, color,
+                   (round(size[0] * scale), round(size[1] * scale))
+                   if size else (width, height),
+                   scale_factor)
+            for name, (filename, color, size, scale_factor)
+            in cls.SPRITES.items()
+        }
+
+    def px(self, length):
+        """Scale a layout length in pixels to the render resolution"""
+        return round(length * self.scale)
+
+    def draw(self, screen, sim):
         """Draw the current game state"""
-        if self.game_over:
-            if self.success:
-                self.draw_victory_screen(screen)
+        if sim.game_over:
+            if sim.success:
+                self.draw_victory_screen(screen, sim)
             else:
-                self.draw_game_over_screen(screen)
+                self.draw_game_over_screen(screen, sim)
             return
 
         # Draw minigame background instead of solid color
         screen.blit(self.minigame_background, (0, 0))
+        self.draw_dynamic(screen, sim, rects=False)
 
-        # Draw falling obstacles
-        for obstacle in self.obstacles:
-            screen.blit(obstacle['sprite'], obstacle['pos'])
-
-        # Draw IED and player sprite
-        screen.blit(self.ied_sprite, self.ied_pos)
-        screen.blit(self.robot_sprite, self.player_pos)
-
-        # Draw UI elements
-        self.draw_resource_bars(screen)
-        self.draw_lives(screen)
-
-    def check_collision_with_obstacles(self):
-        """Check if player has collided with any falling obstacles"""
-        player_rect = pygame.Rect(
-            self.player_pos[0], self.player_pos[1], 120, 120)
-
-        for obstacle in self.obstacles:
-            obstacle_rect = pygame.Rect(
-                obstacle['pos'][0], obstacle['pos'][1], 50, 50)
-            if player_rect.colliderect(obstacle_rect):
-                print(f"Collision detected with obstacle at {obstacle['pos']}")
-                self.game_over = True
-                self.success = False
-                return True
-        return False
-
-    def check_ied_collision(self):
-        """Check if player has found the IED"""
-        # Define smaller collision boxes for more precise detection
-        player_rect = pygame.Rect(
-            self.player_pos[0] + 30,  # Offset to center of sprite
-            self.player_pos[1] + 30,  # Offset to center of sprite
-            60,  # Smaller collision box
-            60   # Smaller collision box
-        )
-
-        ied_rect = pygame.Rect(
-            self.ied_pos[0],
-            self.ied_pos[1],
-            40,  # Match IED sprite size
-            40   # Match IED sprite size
-        )
-
-        if player_rect.colliderect(ied_rect):
-            print(f"IED found at {self.ied_pos}")
-            self.game_over = True
-            self.success = True
-            return True
-        return False
-
-    def update(self):
-        """Update the game state"""
-        if self.game_over:
-            return
-
-        # Check for IED collision first
-        if self.check_ied_collision():
-            return
+    def draw_dirty(self, screen, sim, dirty, full=False):
+        """Draw a round in progress, restoring only what moved.
 
-        # Update obstacle positions
-        for obstacle in self.obstacles[:]:
-            obstacle['pos'][1] += 1.58203125  # Falling speed of obstacles
-
-            # Remove obstacles that are off screen
-            if obstacle['pos'][1] > self.height:
-                self.obstacles.remove(obstacle)
-
-        # Spawn new obstacles
-        # Increased range from 1-30 to 1-40 to reduce spawn rate by 25%
-        if random.randint(1, 40) == 1:
-            self.spawn_obstacle()
-
-        # Check for collisions
-        if self.check_collision_with_obstacles():
-            self.lose_life()
-            return
+        `dirty` is the screen's DirtyRectTracker. Returns the rects to
+        pass to pygame.display.update().
+        """
+        if dirty.needs_static():
+            dirty.build_static(
+                screen,
+                lambda layer: layer.blit(self.minigame_background, (0, 0)))
+            full = True
+        dirty.begin(screen, full)
+        dirty.extend(self.draw_dynamic(screen, sim))
+        return dirty.end()
+
+    def draw_dynamic(self, screen, sim, rects=True):
+        """Draw everything over the background.
+
+        Sprites go to the screen in one Surface.blits() call.
+        Returns the drawn rects, or [] when `rects` is False.
+        """
+        alpha = self.alpha
+        scale = self.scale
+        # Falling obstacles where they were part way through the current
+        # step, positioned for the whole field at once
+        x, y, kind = sim.obstacles.live()
+        fall_offset = (alpha - 1) * sim.FALL_SPEED
+        obstacle_blits = zip(
+            self.obstacle_sprites[kind].tolist(),
+            zip((x * scale).tolist(), ((y + fall_offset) * scale).tolist()))
+
+        # IED and player sprite
+        ied_x, ied_y = sim.ied_pos
+        (prev_x, prev_y), (x, y) = sim.prev_player_pos, sim.player_pos
+        sprite_blits = [
+            (self.ied_sprite, (ied_x * scale, ied_y * scale)),
+            (self.robot_sprite,
+             ((prev_x + (x - prev_x) * alpha) * scale,
+              (prev_y + (y - prev_y) * alpha) * scale)),
+        ]
 
-        # Update battery drain
-        self.battery -= self.BATTERY_DRAIN
-        if self.battery <= 0:
-            print("Game Over: Battery depleted")
-            self.lose_life()
+        # Lives in the HUD; their layout only changes with the count
+        drawn = screen.blits(
+            itertools.chain(obstacle_blits, sprite_blits,
+                            self.lives_blits(sim)),
+            doreturn=rects)
 
-    def lose_life(self):
-        """Handle losing a life"""
-        self.lives -= 1  # Decrement lives first
-        print(f"Life lost in minigame. Lives remaining: {self.lives}")
-        self.game_over = True
-        self.success = False
+        hud_rects = self.draw_resource_bars(screen, sim)
+        hud_rects.append(self.draw_proximity_indicator(screen, sim))
+        if not rects:
+            return []
+        drawn.extend(hud_rects)
+        return drawn
 
-    def draw_game_over_screen(self, screen):
+    def draw_game_over_screen(self, screen, sim):
         """Draw game over screen with final score"""
         screen.blit(self.gameover_image, (0, 0))
 
         # Draw "Game Over" text
-        game_over_text = self.game_over_font.render(
-            "Game Over", True, (255, 0, 0))
+        game_over_text = text_cache.render(
+            self.game_over_font, "Game Over", (255, 0, 0))
         screen.blit(game_over_text,
                     (self.width//2 - game_over_text.get_width()//2,
-                     self.height//2 - 100))
+                     self.height//2 - self.px(100)))
 
         # Display final score
-        score_text = self.game_over_font.render(
-            f"Final Score: {int(self.points)}", True, (255, 255, 0)
+        score_text = text_cache.render(
+            self.game_over_font, f"Final Score: {int(sim.points)}",
+            (255, 255, 0)
         )
         screen.blit(
             score_text,
             (self.width // 2 - score_text.get_width() // 2, self.height // 2),
         )
 
-    def reset_game(self):
-        """Reset the game state for another attempt"""
-        self.battery = 100  # Reset battery to full
-        # Reset player position
-        self.player_pos = [(self.width // 2) - 60, (self.height // 2) - 60]
-        self.obstacles = []  # Clear all obstacles
-        self.place_ied()  # Place a new IED
-        self.game_over = False  # Reset game_over flag
-        self.success = False  # Reset success flag
-
-    def draw_transition_page(self, screen):
+    def draw_transition_page(self, screen, sim):
         """Draw the transition page after losing a life"""
         screen.blit(self.gameover_image, (0, 0))
 
         # Draw "Life Lost" text
-        life_lost_text = self.game_over_font.render(
-            "Life Lost", True, (255, 0, 0))
+        life_lost_text = text_cache.render(
+            self.game_over_font, "Life Lost", (255, 0, 0))
         screen.blit(life_lost_text,
                     (self.width // 2 - life_lost_text.get_width() // 2,
-                     self.height // 2 - 100))
+                     self.height // 2 - self.px(100)))
 
         # Draw remaining lives centered - show current lives after loss
-        remaining_lives = max(0, self.lives)  # Ensure non-negative
+        remaining_lives = max(0, sim.lives)  # Ensure non-negative
         # Width of all life sprites together
-        total_width = remaining_lives * 70
+        spacing = self.px(70)
+        total_width = remaining_lives * spacing
         start_x = (self.width - total_width) // 2  # Center point
 
-        print(
-            f"Drawing transition page with {remaining_lives} lives remaining")
+        log.debug("Drawing transition page with %d lives remaining",
+                  remaining_lives)
 
-        for i in range(remaining_lives):
-            screen.blit(self.life_sprite,
-                        (start_x + (i * 70),
-                         self.height // 2 + 50))
+        draw_list = self.transition_lives.get(remaining_lives)
+        if draw_list is None:
+            draw_list = self.transition_lives[remaining_lives] = [
+                (self.life_sprite,
+                 (start_x + (i * spacing), self.height // 2 + self.px(50)))
+                for i in range(remaining_lives)
+            ]
+        screen.blits(draw_list, doreturn=False)
 
-    def draw_resource_bars(self, screen):
+    def draw_resource_bars(self, screen, sim):
         """Draw the battery level on the screen"""
         # Draw battery bar
         # Red background for battery bar
-        pygame.draw.rect(screen, (255, 0, 0), (20, 50, 200, 20))
+        px = self.px
+        bar_rect = pygame.draw.rect(
+            screen, (255, 0, 0), (px(20), px(50), px(200), px(20)))
         # Green foreground for battery level
-        pygame.draw.rect(screen, (0, 255, 0), (20, 50, self.battery * 2, 20))
+        pygame.draw.rect(
+            screen, (0, 255, 0),
+            (px(20), px(50), px(sim.battery * 2), px(20)))
 
         # Add battery label
-        battery_text = self.game_over_small_font.render(
-            f"Battery: {self.battery:.0f}%", True, (255, 255, 255))
-        screen.blit(battery_text, (20, 25))
+        battery_text = text_cache.render(
+            self.game_over_small_font, f"Battery: {sim.battery:.0f}%",
+            (255, 255, 255))
+        return [bar_rect, screen.blit(battery_text, (px(20), px(25)))]
 
-    def draw_proximity_indicator(self, screen):
-        distance = ((self.player_pos[0] - self.ied_pos[0])**2 +
-                    (self.player_pos[1] - self.ied_pos[1])**2)**0.5
-        max_distance = (self.width**2 + self.height**2)**0.5
-        intensity = int(255 * (1 - distance/max_distance))
-        pygame.draw.circle(screen, (intensity, 0, 0),
-                           (self.width - 30, 30), 15)
+    def draw_proximity_indicator(self, screen, sim):
+        """Draw the IED detector lamp next to the battery bar.
 
-    def draw_lives(self, screen):
+        Its colour grades with the player's closeness to the IED and it
+        lights up on each beep of the sim's detector.
+        """
+        colors = self.lamp_lit if sim.beeping else self.lamp_dim
+        return pygame.draw.circle(
+            screen, colors[sim.player_proximity()],
+            (self.px(245), self.px(60)), self.px(12))
+
+    def lives_blits(self, sim):
+        """Return the cached HUD draw list for the remaining lives"""
+        lives = max(0, sim.lives)
+        draw_list = self.hud_lives.get(lives)
+        if draw_list is None:
+            draw_list = self.hud_lives[lives] = [
+                (self.life_sprite,
+                 (self.width - self.px(80)
+                  - i * self.px(70),  # Spacing between sprites
+                  self.px(20)))  # Distance from top
+                for i in range(lives)
+            ]
+        return draw_list
+
+    def draw_lives(self, screen, sim):
         """Draw the remaining lives during gameplay"""
-        for i in range(max(0, self.lives)):
-            screen.blit(self.life_sprite,
-                        (self.width - 80 - (i * 70),  # Spacing between sprites
-                         20))  # Distance from top
-
-    def move_player(self, dx, dy):
-        """Move the player and check for collisions"""
-        if self.game_over:
-            return
+        return screen.blits(self.lives_blits(sim))
+
+    def draw_victory_screen(self, screen, sim):
+        """Draw victory message"""
+        font = self.game_over_font
+        text1 = text_cache.render(font, "HOYAHHH NAVY EOD!!!", (255, 255, 0))
+        text2 = text_cache.render(font, "LLTB", (255, 255, 0))
 
-        new_x = self.player_pos[0] + dx * self.MOVE_SPEED
-        new_y = self.player_pos[1] + dy * self.MOVE_SPEED
+        screen.blit(text1, (self.width//2 - text1.get_width()//2,
+                            self.height//2 - self.px(50)))
+        screen.blit(text2, (self.width//2 - text2.get_width()//2,
+                            self.height//2 + self.px(50)))
 
-        # Check boundaries
-        if 0 <= new_x < self.width - 120 and 0 <= new_y < self.height - 120:
-            self.player_pos = [new_x, new_y]
-            print(f"Player moved to {self.player_pos}")
+    def draw_celebration_screen(self, screen, sim):
+        """Draw the celebration screen when the player wins"""
+        # Loaded at full screen size, so no scaling per frame
+        screen.blit(self.celebration_background, (0, 0))
 
-            # Check IED collision immediately after movement
-            if self.check_ied_collision():
-                return
+        # Draw "Mission Success" text
+        success_text = text_cache.render(
+            self.game_over_font, "Mission Success!", (0, 255, 0))
+        screen.blit(success_text,
+                    (self.width // 2 - success_text.get_width() // 2,
+                     self.height // 2 - self.px(50)))
 
-            # Check for obstacle collisions
-            if self.check_collision_with_obstacles():
-                return
+        # Draw "Returning to Travel" text
+        return_text = text_cache.render(
+            self.game_over_small_font, "Returning to Travel...",
+            (255, 255, 255))
+        screen.blit(return_text,
+                    (self.width // 2 - return_text.get_width() // 2,
+                     self.height // 2 + self.px(50)))
 
-    def place_ied(self):
-        """Place IED at a random screen location.
 
-        Ensures a minimum distance from the player.
-        """
-        min_distance = 200  # Minimum pixel distance between IED and player
-        while True:
-            x = random.randint(0, self.width - 40)
-            y = random.randint(0, self.height - 40)
-
-            # Calculate distance between proposed IED position and player
-            distance = ((x - self.player_pos[0]) **
-                        2 + (y - self.player_pos[1])**2)**0.5
-
-            # Only place IED if it's far enough from player
-            if distance >= min_distance:
-                self.ied_pos = [x, y]
-                print(
-                    f"IED placed at ({x}, {y}), distance from player: "
-                    f"{distance:.0f}"
-                )
-                break
-
-    def spawn_obstacle(self):
-        """Spawn new falling obstacle at random x position"""
-        x = random.randint(0, self.width - 50)
-
-        # Spawn TNT only if not in operator mode.
-        # Spawn both TNT and Doge if operator mode is enabled.
-        if self.operator_mode:
-            obstacle_type = random.choice(['tnt', 'doge'])
-        else:
-            obstacle_type = 'tnt'
-
-        sprite = (
-            self.tnt_sprite if obstacle_type == 'tnt' else self.doge_sprite
+class IEDMiniGame(MinigameSim):
+    """MinigameSim paired with a MinigameRenderer for in-game use"""
+
+    def __init__(
+        self,
+        screen_width,
+        screen_height,
+        initial_battery=100,
+        lives=3,
+        operator_mode=False,
+        points=0,
+        renderer=None,
+        rng=None,
+        difficulty='normal',
+        obstacles=None,
+    ):
+        super().__init__(
+            screen_width,
+            screen_height,
+            initial_battery,
+            lives,
+            operator_mode,
+            points,
+            rng=rng,
+            difficulty=difficulty,
+            obstacles=obstacles,
         )
-        self.obstacles.append({
-            'type': obstacle_type,
-            'pos': [x, -50],
-            'sprite': sprite
-        })
-        print(f"Spawned obstacle: {obstacle_type} at x={x}")
+        if renderer is None:
+            renderer = MinigameRenderer(screen_width, screen_height)
+        self.renderer = renderer
 
-    def draw_victory_screen(self, screen):
-        """Draw victory message"""
-        font = pygame.font.SysFont("consolas", 48)
-        text1 = font.render("HOYAHHH NAVY EOD!!!", True, (255, 255, 0))
-        text2 = font.render("LLTB", True, (255, 255, 0))
+    def draw(self, screen):
+        """Draw the current game state"""
+        self.renderer.draw(screen, self)
 
-        screen.blit(
-            text1, (self.width//2 - text1.get_width()//2, self.height//2 - 50))
-        screen.blit(
-            text2, (self.width//2 - text2.get_width()//2, self.height//2 + 50))
+    def draw_game_over_screen(self, screen):
+        """Draw game over screen with final score"""
+        self.renderer.draw_game_over_screen(screen, self)
 
-    def check_collision(self, pos1, pos2):
-        """Check if two positions are close enough to collide"""
-        return (abs(pos1[0] - pos2[0]) < 40 and
-                abs(pos1[1] - pos2[1]) < 40)
+    def draw_transition_page(self, screen):
+        """Draw the transition page after losing a life"""
+        self.renderer.draw_transition_page(screen, self)
+
+    def draw_victory_screen(self, screen):
+        """Draw victory message"""
+        self.renderer.draw_victory_screen(screen, self)
 
     def draw_celebration_screen(self, screen):
         """Draw the celebration screen when the player wins"""
-        # Scale the celebration background to full screen size
-        scaled_width = int(self.width * 1.00)
-        scaled_height = int(self.height * 1.00)
-        scaled_bg = pygame.transform.scale(
-            self.celebration_background, (scaled_width, scaled_height))
-        x_offset = (self.width - scaled_width) // 2
-        y_offset = (self.height - scaled_height) // 2
-        screen.blit(scaled_bg, (x_offset, y_offset))
+        self.renderer.draw_celebration_screen(screen, self)
 
-        # Draw "Mission Success" text
-        success_text = self.game_over_font.render(
-            "Mission Success!", True, (0, 255, 0))
-        screen.blit(success_text,
-                    (self.width // 2 - success_text.get_width() // 2,
-                     self.height // 2 - 50))
+    def draw_resource_bars(self, screen):
+        """Draw the battery level on the screen"""
+        self.renderer.draw_resource_bars(screen, self)
 
-        # Draw "Returning to Travel" text
-        return_text = self.game_over_small_font.render(
-            "Returning to Travel...", True, (255, 255, 255))
-        screen.blit(return_text,
-                    (self.width // 2 - return_text.get_width() // 2,
-                     self.height // 2 + 50))
+    def draw_lives(self, screen):
+        """Draw the remaining lives during gameplay"""
+        self.renderer.draw_lives(screen, self)
+
+    def draw_proximity_indicator(self, screen):
+        self.renderer.draw_proximity_indicator(screen, self)
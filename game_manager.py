@@ -1,196 +1,445 @@
+import random
 import pygame
-from states import GameState
-from screens import MenuScreen, TravelScreen, MinigameScreen, OutcomeScreen
-from game import IEDMiniGame
+from states import GameState, StateManager
+from screens import (
+    MenuScreen, TravelScreen, MinigameScreen, OutcomeScreen,
+    InterstitialScreen,
+)
+from minigame_sim import MinigameSim, DIFFICULTIES
+from preload import Preloader
+from profiler import FrameProfiler, GCMonitor, PerfOverlay
+from timestep import FixedTimestep
+from utils import present_scaled
+from replay import (
+    Recording, COMMAND_START, COMMAND_START_OPERATOR, COMMAND_QUIT,
+)
+from gamelog import get_logger
+
+
+log = get_logger("game")
+
+SCREEN_CLASSES = {
+    GameState.MENU: MenuScreen,
+    GameState.TRAVEL: TravelScreen,
+    GameState.MINIGAME: MinigameScreen,
+    GameState.OUTCOME: OutcomeScreen,
+    GameState.INTERSTITIAL: InterstitialScreen,
+}
+
+# States whose assets are loaded in the background on entering a state
+NEXT_STATES = {
+    GameState.MENU: (GameState.TRAVEL, GameState.MINIGAME),
+    GameState.TRAVEL: (GameState.MINIGAME, GameState.OUTCOME),
+}
 
 
 class GameManager:
     def __init__(
-        self, width, height, asset_loader, music_manager, font_manager
+        self, width, height, asset_loader, music_manager, font_manager,
+        difficulty='normal', dirty_rects=False, profile_path=None, fps=60,
+        seed=None, record_path=None, render_scale=1.0
     ):
         self.width = width
         self.height = height
         self.screen = pygame.display.set_mode((width, height))
+        # Screens draw into `frame`. With a render scale below 1 that is
+        # a smaller offscreen surface, upscaled to the display once per
+        # frame, which cuts the pixels drawn by 1 / render_scale**2.
+        self.render_scale = render_scale
+        self.frame = self.screen
+        if render_scale != 1:
+            self.frame = pygame.Surface(
+                (round(width * render_scale), round(height * render_scale))
+            ).convert()
         self.clock = pygame.time.Clock()
         self.running = True
+        # Render rate cap (0 for uncapped); the simulation always runs at
+        # a fixed rate, stepped from the time each frame took
+        self.fps = fps
+        self.timestep = FixedTimestep(MinigameSim.STEP_HZ)
 
         # Initialize managers
         self.asset_loader = asset_loader
         self.music_manager = music_manager
         self.font_manager = font_manager
+        # Fonts for the screens, sized for the render resolution
+        self.screen_fonts = font_manager.scaled(render_scale)
 
-        # Initialize screens
-        self.screens = {
-            GameState.MENU: MenuScreen(
-                width, height, asset_loader, font_manager, music_manager
-            ),
-            GameState.TRAVEL: TravelScreen(
-                width, height, asset_loader, font_manager, music_manager
-            ),
-            GameState.MINIGAME: MinigameScreen(
-                width, height, asset_loader, font_manager, music_manager
-            ),
-            GameState.OUTCOME: OutcomeScreen(
-                width, height, asset_loader, font_manager, music_manager
-            ),
-        }
-
-        # Initialize game state
-        self.current_state = GameState.MENU
-        self.game_data = {
-            'points': 0,
-            'lives': 3,
-            'battery': 100,
-            'fuel': 100,
-            'morale': 100
-        }
-
-        # Add points tracking
-        self.game_start_time = None
-
-        # Initialize timers
-        self.timers = {
-            'travel': None,
-            'game_start': None
-        }
-
-        # Start menu music
-        self.music_manager.play('menu')
+        # Game state, shared data and transitions. Each screen is built
+        # the first time its state is entered.
+        self.states = StateManager(self.build_screen)
+        # Called when the current interstitial screen times out
+        self.after_interstitial = None
+
+        # Opt-in renderer that only pushes changed regions to the display
+        self.dirty_rects = dirty_rects
+        self.last_drawn_state = None
+
+        # Per-phase frame timings; F3 toggles the live overlay, and the
+        # session is written to profile_path (if set) when the game ends
+        self.profiler = FrameProfiler()
+        self.perf_overlay = PerfOverlay(
+            self.profiler, font_manager.get_font('small'))
+        self.profile_path = profile_path
+        self.update_phases = {
+            state: f"{state.value}.update" for state in GameState}
+        self.draw_phases = {
+            state: f"{state.value}.draw" for state in GameState}
+        # Collections are timed too, and kept off long-lived objects while
+        # a round is on
+        self.gc_monitor = GCMonitor(self.profiler)
+        overlay = self.perf_overlay
+        overlay.add_counter("obstacles", self.obstacle_pool_stat('count'))
+        overlay.add_counter("obstacle slots",
+                            self.obstacle_pool_stat('capacity'))
+        overlay.add_counter("obstacle spawns",
+                            self.obstacle_pool_stat('spawned'))
+        overlay.add_counter("obstacle grows",
+                            self.obstacle_pool_stat('grows'))
+        overlay.add_counter("gc gen0",
+                            lambda: self.gc_monitor.collections[0])
+        overlay.add_counter("gc gen2",
+                            lambda: self.gc_monitor.collections[2])
+
+        # Loads upcoming states' assets in the background
+        self.preloader = Preloader(asset_loader, music_manager)
 
         self.operator_mode = False
+        # Minigame difficulty preset (see minigame_sim.DIFFICULTIES)
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"unknown difficulty {difficulty!r}, expected "
+                             f"one of {', '.join(DIFFICULTIES)}")
+        self.difficulty = difficulty
+
+        # Every random choice in a session comes from this seeded RNG, so
+        # the seed plus the recorded input reproduces it exactly
+        if seed is None:
+            seed = random.randrange(2**63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Input is recorded to record_path (if set) when the game ends
+        self.record_path = record_path
+        self.recording = None
+        if record_path:
+            self.recording = Recording(
+                seed, difficulty, self.timestep.step_hz)
+        self.replayer = None  # Set by replay.replay()
+
+        states = self.states
+        for state in GameState:
+            states.on_enter(state, self.prefetch_next)
+        states.on_enter(GameState.MENU, self.enter_menu)
+        states.on_enter(GameState.TRAVEL, self.enter_travel)
+        states.on_exit(GameState.TRAVEL, self.exit_travel)
+        states.on_enter(GameState.MINIGAME, self.enter_minigame)
+        states.on_exit(GameState.MINIGAME, self.exit_minigame)
+        states.on_enter(GameState.OUTCOME, self.enter_outcome)
+        states.start(GameState.MENU)
+
+    @property
+    def current_state(self):
+        return self.states.current_state
+
+    @property
+    def game_data(self):
+        return self.states.game_data
+
+    def obstacle_pool_stat(self, name):
+        """Return a reader for one attribute of the obstacle pool"""
+        def read():
+            screen = self.states.screens.get(GameState.MINIGAME)
+            if screen is None or screen.obstacles is None:
+                return 0
+            return getattr(screen.obstacles, name)
+        return read
+
+    def build_screen(self, state):
+        """Create the screen for a state; called on its first entry"""
+        screen = SCREEN_CLASSES[state](
+            self.width, self.height, self.asset_loader, self.screen_fonts,
+            self.music_manager, scale=self.render_scale
+        )
+        if state == GameState.MENU:
+            screen.preloader = self.preloader  # To show load progress
+        return screen
+
+    def prefetch_next(self, previous_state):
+        """Queue the assets of the states likely to follow this one"""
+        for state in NEXT_STATES.get(self.current_state, ()):
+            SCREEN_CLASSES[state].queue_preload(
+                self.preloader, self.width, self.height, self.render_scale)
+
+    def enter_menu(self, previous_state):
+        self.music_manager.play('menu')
+
+    def enter_travel(self, previous_state):
+        self.music_manager.play('travel')
+        self.states.update_timer('travel', self.timestep.time_ms)
+
+    def exit_travel(self, next_state):
+        self.states.update_timer('travel', None)
+
+    def enter_minigame(self, previous_state):
+        """Start a new round with the current lives and points"""
+        # Anything still loading is needed now
+        self.preloader.finish()
+        self.music_manager.play('minigame')
+        self.states.screen(GameState.MINIGAME).init_game(
+            battery=self.game_data['battery'],
+            lives=self.game_data['lives'],
+            operator_mode=self.operator_mode,
+            points=self.game_data['points'],
+            difficulty=self.difficulty,
+            rng=self.rng,
+        )
+        self.gc_monitor.freeze()
+        log.info("Transitioning to minigame with %d lives",
+                 self.game_data['lives'])
+
+    def exit_minigame(self, next_state):
+        self.gc_monitor.thaw()
+
+    def enter_outcome(self, previous_state):
+        # Game over - the final score is frozen from here on
+        log.info("Game Over. Final score: %d", self.game_data['points'])
+        self.music_manager.play('gameover')
 
     def handle_input(self):
         """Handle input events"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                self.running = False
+                self.quit()
             elif event.type == pygame.KEYDOWN:
                 self.handle_keydown(event.key)
 
             # Pass events to menu screen for code input
             if self.current_state == GameState.MENU:
-                self.screens[GameState.MENU].handle_input(event)
-
-        # Handle continuous input for minigame
-        if self.current_state == GameState.MINIGAME:
-            self.screens[GameState.MINIGAME].handle_input(None)
+                self.states.screen().handle_input(event)
+        # Held minigame movement keys are read on every sim step
 
     def handle_keydown(self, key):
         """Handle keyboard input"""
+        if key == pygame.K_F3:
+            self.perf_overlay.toggle()
+            # Repaint whatever the overlay covered
+            self.last_drawn_state = None
+            return
+
         if self.current_state == GameState.MENU:
             if key == pygame.K_1:
-                menu_screen = self.screens[GameState.MENU]
+                menu_screen = self.states.screen()
                 # Check for operator code
-                if menu_screen.code_input in ["5337", "5335"]:
-                    self.operator_mode = True
-                    print("Operator mode activated")
-
-                self.music_manager.play('travel')  # Start travel music
-                self.current_state = GameState.TRAVEL
-                self.timers['travel'] = pygame.time.get_ticks()
-                self.game_start_time = pygame.time.get_ticks()
-                # Start tracking time
+                self.start_mission(
+                    menu_screen.code_input in ["5337", "5335"])
             elif key == pygame.K_2:
-                self.running = False
+                self.quit()
+
+    def start_mission(self, operator_mode=False):
+        """Leave the menu and start travelling"""
+        if self.recording is not None:
+            self.recording.add_command(
+                self.timestep.steps,
+                COMMAND_START_OPERATOR if operator_mode else COMMAND_START)
+        if operator_mode:
+            self.operator_mode = True
+            log.info("Operator mode activated")
+
+        self.states.change_state(GameState.TRAVEL)
+        # Start tracking time
+        self.states.update_timer('game_start', self.timestep.time_ms)
+
+    def quit(self):
+        """Stop the main loop"""
+        if self.recording is not None:
+            self.recording.add_command(self.timestep.steps, COMMAND_QUIT)
+        self.running = False
+
+    def update(self, dt_ms=None):
+        """Update game state for a frame that took dt_ms.
+
+        Runs as many fixed sim steps as fit in the time (one step if
+        dt_ms is None).
+        """
+        if not self.preloader.ready:
+            self.preloader.pump()
+        self.music_manager.update()
+
+        if dt_ms is None:
+            dt_ms = self.timestep.step_ms
+        for _ in range(self.timestep.advance(dt_ms)):
+            self.timestep.step()
+            self.step()
+
+    def step(self):
+        """Advance the game by one fixed sim step.
+
+        Everything here depends only on simulated time and input, so a
+        session plays out the same however its steps fall into frames.
+        """
+        now = self.timestep.time_ms
 
-    def update(self):
-        """Update game state"""
         # Only update points if not in OUTCOME state
+        game_start = self.states.get_timer('game_start')
         if (
             self.current_state != GameState.OUTCOME
-            and self.game_start_time is not None
+            and game_start is not None
         ):
-            elapsed_seconds = (
-                pygame.time.get_ticks() - self.game_start_time
-            ) // 1000
+            elapsed_seconds = int(now - game_start) // 1000
             self.game_data['points'] = elapsed_seconds
 
-        current_screen = self.screens.get(self.current_state)
-        if not current_screen:
+        current_screen = self.states.screen()
+
+        if self.current_state == GameState.INTERSTITIAL:
+            current_screen.now = now
+            if current_screen.finished(now):
+                self.after_interstitial()
             return
 
         if self.current_state == GameState.TRAVEL:
-            current_screen.update()  # Update truck animation
+            # Update truck animation
+            with self.profiler.phase(self.update_phases[GameState.TRAVEL]):
+                current_screen.update()
 
             # Check for automatic transition to minigame
-            if self.timers['travel'] is not None:
-                elapsed = (
-                    pygame.time.get_ticks() - self.timers['travel']
-                ) / 1000
+            travel_start = self.states.get_timer('travel')
+            if travel_start is not None:
+                elapsed = (now - travel_start) / 1000
                 if elapsed >= 3:  # Transition after 3 seconds
-                    self.transition_to_minigame()
+                    self.states.change_state(GameState.MINIGAME)
                     return
 
         if self.current_state == GameState.MINIGAME:
-            current_screen.update()
             minigame = current_screen.ied_game
+            with self.profiler.phase(
+                    self.update_phases[GameState.MINIGAME]):
+                current_screen.update(self.next_input(current_screen))
 
             if minigame:
                 minigame.points = self.game_data['points']
 
             if minigame and minigame.game_over:
                 if minigame.success:
-                    minigame.draw_celebration_screen(self.screen)
-                    pygame.display.flip()
-                    pygame.time.delay(2000)
                     self.game_data['points'] += 100  # Bonus points for success
-                    self.current_state = GameState.TRAVEL
-                    self.timers['travel'] = pygame.time.get_ticks()
-                    self.music_manager.play('travel')
+                    self.show_interstitial(
+                        minigame.draw_celebration_screen,
+                        self.return_to_travel,
+                    )
                 else:
                     # Update lives in game_data and minigame
                     if self.game_data['lives'] > 0:
                         self.game_data['lives'] -= 1
                         minigame.lives = self.game_data['lives']  # Sync lives
-                        print(
-                            f"Life lost. Lives remaining: "
-                            f"{self.game_data['lives']}"
-                        )
+                        log.info("Life lost. Lives remaining: %d",
+                                 self.game_data['lives'])
 
                     if self.game_data['lives'] <= 0:
-                        # Game over - freeze final score
-                        print(
-                            f"Game Over. Final score: "
-                            f"{self.game_data['points']}"
-                        )
-                        self.current_state = GameState.OUTCOME
-                        self.music_manager.play('gameover')
+                        self.states.change_state(GameState.OUTCOME)
                     else:
-                        minigame.draw_transition_page(self.screen)
-                        pygame.display.flip()
-                        pygame.time.delay(2000)
-                        self.current_state = GameState.TRAVEL
-                        self.timers['travel'] = pygame.time.get_ticks()
-                        self.music_manager.play('travel')
+                        self.show_interstitial(
+                            minigame.draw_transition_page,
+                            self.return_to_travel,
+                        )
+
+    def next_input(self, minigame_screen):
+        """Return this step's minigame input bitmask.
+
+        Comes from the replay when one is playing, and otherwise from the
+        keyboard (and is recorded if a recording is on).
+        """
+        if self.replayer is not None:
+            return self.replayer.next_input()
+        input_mask = minigame_screen.read_input()
+        if self.recording is not None:
+            self.recording.add_input(input_mask)
+        return input_mask
+
+    def show_interstitial(
+        self, draw_content, on_finish, duration=2000, fade_in=0,
+        fade_out=300
+    ):
+        """Show a timed full-screen message, then call on_finish()"""
+        interstitial = self.states.screen(GameState.INTERSTITIAL)
+        interstitial.start(
+            draw_content, self.timestep.time_ms, duration, fade_in,
+            fade_out
+        )
+        self.after_interstitial = on_finish
+        self.states.change_state(GameState.INTERSTITIAL)
+
+    def return_to_travel(self):
+        """Resume travelling towards the next minigame"""
+        self.states.change_state(GameState.TRAVEL)
 
     def draw(self):
         """Draw current game state"""
-        current_screen = self.screens.get(self.current_state)
+        current_screen = self.states.screen()
+        if current_screen:
+            current_screen.alpha = self.timestep.alpha
+        if self.dirty_rects:
+            self.draw_dirty(current_screen)
+            return
+
         if current_screen:
-            current_screen.draw(self.screen, self.game_data)
+            with self.profiler.phase(self.draw_phases[self.current_state]):
+                current_screen.draw(self.frame, self.game_data)
+        if self.frame is not self.screen:
+            present_scaled(self.frame, self.screen)
+        # Drawn at display resolution, so it stays readable
+        self.perf_overlay.draw(self.screen)
 
         pygame.display.flip()
 
+    def draw_dirty(self, current_screen):
+        """Draw current game state, updating only the changed regions"""
+        if not current_screen:
+            pygame.display.flip()
+            return
+
+        # Entering a screen always starts with a full redraw, as does
+        # every frame under the translucent performance overlay
+        full = (self.current_state != self.last_drawn_state
+                or self.perf_overlay.visible)
+        self.last_drawn_state = self.current_state
+
+        with self.profiler.phase(self.draw_phases[self.current_state]):
+            rects = current_screen.draw_dirty(
+                self.frame, self.game_data, full)
+        if self.frame is not self.screen:
+            rects = present_scaled(self.frame, self.screen, rects)
+        overlay_rect = self.perf_overlay.draw(self.screen)
+        if overlay_rect:
+            rects = [self.screen.get_rect()]
+        if rects:
+            pygame.display.update(rects)
+
     def run(self):
         """Main game loop"""
-        while self.running:
-            self.handle_input()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
-
-    def transition_to_minigame(self):
-        """Handle transition to minigame state"""
-        self.music_manager.play('minigame')
-        minigame_screen = self.screens[GameState.MINIGAME]
-        minigame_screen.init_game(
-            battery=self.game_data['battery'],
-            lives=self.game_data['lives'],
-            operator_mode=self.operator_mode,
-            points=self.game_data['points'],
-        )
-        print(
-            f"Transitioning to minigame with {self.game_data['lives']} lives"
-        )
-        self.current_state = GameState.MINIGAME
-        self.timers['travel'] = None
+        profiler = self.profiler
+        input_phase = profiler.phase("input")
+        update_phase = profiler.phase("update")
+        draw_phase = profiler.phase("draw")
+        tick_phase = profiler.phase("tick")
+        # Time the previous frame took; the first frame runs one step
+        dt_ms = self.timestep.step_ms
+        try:
+            while self.running:
+                profiler.begin_frame()
+                with input_phase:
+                    self.handle_input()
+                with update_phase:
+                    self.update(dt_ms)
+                with draw_phase:
+                    self.draw()
+                with tick_phase:
+                    dt_ms = self.clock.tick(self.fps)
+                profiler.end_frame()
+        finally:
+            self.gc_monitor.close()
+            if self.recording is not None:
+                self.recording.steps = self.timestep.steps
+                self.recording.save(self.record_path)
+                log.info("Recorded %d steps to %s",
+                         self.recording.steps, self.record_path)
+            if self.profile_path:
+                self.profiler.export_json(self.profile_path)
+                log.info("Wrote frame profile to %s", self.profile_path)
@@ -0,0 +1,131 @@
+"""Game logging built on the standard logging module.
+
+Every message goes to a category logger under "bst" (for example
+"bst.minigame.move"), so categories can be switched on and off
+individually. configure() routes them all into a RingBufferHandler:
+emitting a record only appends it to an in-memory ring buffer, and a
+background thread formats and writes the buffer out periodically, so no
+terminal or file I/O happens inside a frame.
+"""
+import atexit
+import logging
+import sys
+import threading
+from collections import deque
+
+
+ROOT = "bst"
+# Level used to switch a category off entirely
+OFF = logging.CRITICAL + 1
+
+
+def get_logger(category):
+    """Return the logger for a category such as 'minigame.move'"""
+    return logging.getLogger(f"{ROOT}.{category}")
+
+
+def set_category_level(category, level):
+    """Set the minimum level for one category (and its children)"""
+    get_logger(category).setLevel(level)
+
+
+def enable_category(category, enabled=True):
+    """Switch a category on (inheriting its parent's level) or off"""
+    set_category_level(category, logging.NOTSET if enabled else OFF)
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps records in a bounded ring buffer until flush().
+
+    When the buffer is full the oldest records are dropped and counted in
+    `dropped`. Formatting is deferred to flush(), which can run on any
+    thread.
+    """
+
+    def __init__(self, capacity=4096, stream=None):
+        super().__init__()
+        self.buffer = deque(maxlen=capacity)
+        self.stream = stream if stream is not None else sys.stdout
+        self.dropped = 0
+
+    def emit(self, record):
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(record)
+
+    def flush(self):
+        """Format and write out everything buffered so far"""
+        lines = []
+        buffer = self.buffer
+        while buffer:
+            try:
+                record = buffer.popleft()
+            except IndexError:
+                break
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+
+
+class LogFlusher(threading.Thread):
+    """Background thread that flushes a RingBufferHandler periodically"""
+
+    def __init__(self, handler, interval=0.25):
+        super().__init__(name="log-flusher", daemon=True)
+        self.handler = handler
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.handler.flush()
+
+    def stop(self):
+        """Stop the thread and write out anything left in the buffer"""
+        self.stopped.set()
+        self.join()
+        self.handler.flush()
+
+
+_flusher = None
+
+
+def configure(level=logging.INFO, capacity=4096, stream=None,
+              flush_interval=0.25, categories=None):
+    """Route all game logging through a ring buffer flushed off-thread.
+
+    `categories` optionally maps category names to levels, e.g.
+    {'minigame.move': logging.DEBUG}. Returns the RingBufferHandler.
+    """
+    global _flusher
+    shutdown()
+
+    root = logging.getLogger(ROOT)
+    root.setLevel(level)
+    root.propagate = False
+
+    handler = RingBufferHandler(capacity, stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    root.handlers[:] = [handler]
+
+    for category, category_level in (categories or {}).items():
+        set_category_level(category, category_level)
+
+    _flusher = LogFlusher(handler, flush_interval)
+    _flusher.start()
+    return handler
+
+
+def shutdown():
+    """Stop the background flusher and write out any buffered records"""
+    global _flusher
+    if _flusher is not None:
+        _flusher.stop()
+        _flusher = None
+
+
+atexit.register(shutdown)
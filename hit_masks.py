@@ -0,0 +1,144 @@
+"""Pixel hit masks for the IED minigame, with no pygame dependency.
+
+Hits in the minigame are decided by the sprites' shapes as drawn at
+layout size: the robot's silhouette against the IED and the obstacles.
+A HitMasks holds each shape as a boolean NumPy array indexed [y, x].
+
+`python asset_pack.py` bakes the masks from the sprites into
+assets/hit_masks.npz. The file is kept in the repository, so MinigameSim,
+the balancing harness and the vector env all play the game's geometry
+without loading any images.
+"""
+import os
+
+import numpy as np
+
+
+HIT_MASKS_FILENAME = "hit_masks.npz"
+
+
+def default_hit_masks_path(base_path):
+    return os.path.join(base_path, "assets", HIT_MASKS_FILENAME)
+
+
+def mask_bounds(mask):
+    """Return the (x, y, width, height) box around a mask's set pixels"""
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if not rows.size:
+        return (0, 0, 0, 0)
+    return (int(cols[0]), int(rows[0]), int(cols[-1] - cols[0] + 1),
+            int(rows[-1] - rows[0] + 1))
+
+
+def hit_table(mask, other):
+    """Return, for every offset of `other` on `mask`, whether they touch.
+
+    Entry [dy + h - 1, dx + w - 1], where (w, h) is `other`'s size, is
+    True if `other` placed at (dx, dy) from `mask`'s top left shares a set
+    pixel with it. The overlap counts are one FFT convolution.
+    """
+    shape = (mask.shape[0] + other.shape[0] - 1,
+             mask.shape[1] + other.shape[1] - 1)
+    counts = np.fft.irfft2(
+        np.fft.rfft2(mask, shape) * np.fft.rfft2(other[::-1, ::-1], shape),
+        shape)
+    return counts > 0.5
+
+
+def table_hits(table, other, dx, dy):
+    """Look up arrays of (dx, dy) offsets in a hit_table()"""
+    rows = dy + (other.shape[0] - 1)
+    cols = dx + (other.shape[1] - 1)
+    inside = ((0 <= rows) & (rows < table.shape[0])
+              & (0 <= cols) & (cols < table.shape[1]))
+    hits = np.zeros(inside.shape, dtype=np.bool_)
+    hits[inside] = table[rows[inside], cols[inside]]
+    return hits
+
+
+class HitMasks:
+    """The player's, IED's and obstacles' hit masks.
+
+    Masks sit at the top left of their sprite's position, and positions
+    are truncated to whole pixels before masks are compared. Before that,
+    the bounds of the player's set pixels are checked against the other
+    masks' boxes, which rules out almost every pair. Whether the player
+    touches the IED or an obstacle at each offset is worked out up front
+    (see hit_table()), so comparing masks is one lookup.
+    """
+
+    def __init__(self, player, ied, obstacles):
+        self.player = np.asarray(player, dtype=np.bool_)
+        self.ied = np.asarray(ied, dtype=np.bool_)
+        # Indexed by the obstacle kind values in obstacles.OBSTACLE_TYPES
+        self.obstacles = [np.asarray(mask, dtype=np.bool_)
+                          for mask in obstacles]
+        self.player_bounds = mask_bounds(self.player)
+        self.ied_size = self.ied.shape[::-1]
+        self.obstacle_size = max(max(mask.shape) for mask in self.obstacles)
+        self.ied_table = hit_table(self.player, self.ied)
+        self.obstacle_tables = [hit_table(self.player, mask)
+                                for mask in self.obstacles]
+
+    @classmethod
+    def boxes(cls, player_size, ied_size, obstacle_size, kinds=2):
+        """Return solid square masks of the given sizes"""
+        return cls(np.ones((player_size, player_size), dtype=np.bool_),
+                   np.ones((ied_size, ied_size), dtype=np.bool_),
+                   [np.ones((obstacle_size, obstacle_size), dtype=np.bool_)
+                    for _ in range(kinds)])
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            count = sum(name.startswith("obstacle") for name in data.files)
+            return cls(data['player'], data['ied'],
+                       [data[f"obstacle{kind}"] for kind in range(count)])
+
+    def save(self, path):
+        np.savez_compressed(
+            path, player=self.player, ied=self.ied,
+            **{f"obstacle{kind}": mask
+               for kind, mask in enumerate(self.obstacles)})
+
+    @staticmethod
+    def _touches(table, other, dx, dy):
+        row = dy + other.shape[0] - 1
+        col = dx + other.shape[1] - 1
+        return (0 <= row < table.shape[0] and 0 <= col < table.shape[1]
+                and bool(table[row, col]))
+
+    def player_hits_obstacle(self, x, y, obstacle_x, obstacle_y, kind):
+        """Return True if the player at (x, y) touches an obstacle"""
+        return self._touches(
+            self.obstacle_tables[kind], self.obstacles[kind],
+            int(obstacle_x) - int(x), int(obstacle_y) - int(y))
+
+    def player_hits_ied(self, x, y, ied_x, ied_y):
+        """Return True if the player at (x, y) touches the IED"""
+        return self._touches(self.ied_table, self.ied,
+                             int(ied_x) - int(x), int(ied_y) - int(y))
+
+    def obstacle_hit(self, x, y, obstacles):
+        """Return the first obstacle in a field touching the player, or -1"""
+        bounds_x, bounds_y, width, height = self.player_bounds
+        for index in obstacles.overlapping(
+                x + bounds_x, y + bounds_y, width, height,
+                self.obstacle_size):
+            if self.player_hits_obstacle(
+                    x, y, obstacles.x[index], obstacles.y[index],
+                    obstacles.kind[index]):
+                return index
+        return -1
+
+    def ied_hit(self, x, y, ied_x, ied_y):
+        """Return True if the player at (x, y) touches the IED"""
+        bounds_x, bounds_y, width, height = self.player_bounds
+        ied_width, ied_height = self.ied_size
+        x0 = x + bounds_x
+        y0 = y + bounds_y
+        if not (x0 < ied_x + ied_width and ied_x < x0 + width
+                and y0 < ied_y + ied_height and ied_y < y0 + height):
+            return False
+        return self.player_hits_ied(x, y, ied_x, ied_y)
@@ -1,12 +1,18 @@
 import pygame
 import sys
 import os
+import gamelog
 from game_manager import GameManager
 from utils import AssetLoader, MusicManager, FontManager
 
 
+log = gamelog.get_logger("main")
+
+
 class BombSquadTrail:
     def __init__(self):
+        # Log level can be raised/lowered with BST_LOG_LEVEL, e.g. DEBUG
+        gamelog.configure(os.environ.get("BST_LOG_LEVEL", "INFO").upper())
         pygame.init()
         pygame.mixer.init()
 
@@ -16,22 +22,42 @@ class BombSquadTrail:
         # Initialize managers
         self.asset_loader = AssetLoader(self.current_dir)
         self.music_manager = MusicManager(self.current_dir)
-        self.font_manager = FontManager()
+        self.font_manager = FontManager(self.current_dir)
+        # BST_PROFILE names a JSON file to write frame timings to on exit;
+        # BST_FPS caps the render rate (0 for uncapped); BST_RECORD names a
+        # file to record the session's input to (see replay.py);
+        # BST_RENDER_SCALE draws at a lower resolution (e.g. 0.5) and
+        # upscales each frame to the window; BST_DIFFICULTY picks a
+        # minigame preset from minigame_sim.DIFFICULTIES (e.g. stress);
+        # BST_DIRTY_RECTS=1 pushes only the changed regions to the display
         self.game_manager = GameManager(1024, 768,
                                         self.asset_loader,
                                         self.music_manager,
-                                        self.font_manager)
+                                        self.font_manager,
+                                        difficulty=os.environ.get(
+                                            "BST_DIFFICULTY", "normal"),
+                                        dirty_rects=bool(int(os.environ.get(
+                                            "BST_DIRTY_RECTS", 0))),
+                                        profile_path=os.environ.get(
+                                            "BST_PROFILE"),
+                                        fps=int(os.environ.get(
+                                            "BST_FPS", 60)),
+                                        record_path=os.environ.get(
+                                            "BST_RECORD"),
+                                        render_scale=float(os.environ.get(
+                                            "BST_RENDER_SCALE", 1)))
 
     def run(self):
         """Start and run the game"""
         try:
             self.game_manager.run()
         except Exception as e:
-            print(f"Error running game: {e}")
+            log.exception("Error running game: %s", e)
         finally:
             # Cleanup
             pygame.mixer.quit()
             pygame.quit()
+            gamelog.shutdown()
             sys.exit()
 
 
@@ -0,0 +1,343 @@
+import functools
+import os
+import random
+import numpy as np
+from gamelog import get_logger
+from hit_masks import HitMasks, default_hit_masks_path
+from obstacles import ObstacleField, OBSTACLE_TYPES, TNT, DOGE
+
+log = get_logger("minigame")
+move_log = get_logger("minigame.move")
+spawn_log = get_logger("minigame.spawn")
+collision_log = get_logger("minigame.collision")
+
+# Obstacle spawn settings per difficulty. Each frame there is a
+# 1-in-`spawn_chance` roll that spawns `spawn_count` obstacles.
+DIFFICULTIES = {
+    'normal': {'spawn_chance': 40, 'spawn_count': 1},
+    # Fills the field with thousands of obstacles for performance testing
+    'stress': {'spawn_chance': 1, 'spawn_count': 8},
+}
+
+
+# Bits of the per-step input bitmask for the held movement keys
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+
+# Instance attributes a `tuning` dict may override, for balancing
+TUNABLE = ('MOVE_SPEED', 'BATTERY_DRAIN', 'spawn_chance', 'spawn_count',
+           'IED_MIN_DISTANCE')
+
+
+# IED detector: the player's closeness to the IED (0-255) is one lookup
+# in a grid with a cell per PROXIMITY_CELL px, rebuilt whenever the IED
+# is placed. The detector beeps for BEEP_STEPS steps, every
+# BEEP_INTERVALS[closeness] steps (once a second far away, ten times a
+# second on top of the IED).
+PROXIMITY_CELL = 16
+BEEP_INTERVALS = tuple(60 - (54 * level) // 255 for level in range(256))
+BEEP_STEPS = 3
+
+
+@functools.lru_cache(maxsize=None)
+def default_hit_masks():
+    """Return the hit masks baked from the game's sprites.
+
+    Loaded once per process. If the baked file is missing, the sprites'
+    boxes are used, which is what the game draws when the sprite images
+    are missing too.
+    """
+    path = default_hit_masks_path(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        return HitMasks.load(path)
+    except (OSError, KeyError, ValueError) as e:
+        log.warning("Hitting sprite boxes, no hit masks at %s: %s", path, e)
+        scale = MinigameSim.SPRITE_SCALE
+        return HitMasks.boxes(
+            int(MinigameSim.PLAYER_SIZE * scale),
+            int(MinigameSim.IED_SIZE * scale),
+            int(MinigameSim.OBSTACLE_SIZE * scale), len(OBSTACLE_TYPES))
+
+
+def rects_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    """Return True if two axis-aligned boxes overlap (pygame.Rect rules)"""
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+class MinigameSim:
+    """Rules of the IED minigame with no pygame dependency.
+
+    Holds all game state and advances it one fixed sim step (1/STEP_HZ
+    of a second) per update() call, whatever the frame rate.
+    Drawing is handled separately by game.MinigameRenderer.
+    """
+
+    PLAYER_SIZE = 120
+    IED_SIZE = 40
+    OBSTACLE_SIZE = 50
+    # Sprites are drawn this much larger than the sizes above, and hits
+    # are decided by their pixels (see hit_masks)
+    SPRITE_SCALE = 1.3
+    # Speeds and drain rates are per update(), which runs at a fixed
+    # STEP_HZ steps per second whatever the frame rate
+    STEP_HZ = 60
+    FALL_SPEED = 1.58203125  # Falling speed of obstacles (px/step)
+
+    def __init__(
+        self,
+        screen_width,
+        screen_height,
+        initial_battery=100,
+        lives=3,
+        operator_mode=False,
+        points=0,
+        rng=None,
+        difficulty='normal',
+        tuning=None,
+        obstacles=None,
+        hit_masks=None,
+    ):
+        self.width = screen_width
+        self.height = screen_height
+        self.rng = rng if rng is not None else random.Random()
+        self.player_pos = [(screen_width // 2) - 60, (screen_height // 2) - 60]
+        # Player position before the current step, for interpolation
+        self.prev_player_pos = self.player_pos
+        self.battery = initial_battery
+        self.lives = lives
+        self.game_over = False
+        self.success = False
+        self.operator_mode = operator_mode
+        self.points = points
+        self.current_sprite = "robot"
+        self.difficulty = difficulty
+        spawn_settings = DIFFICULTIES[difficulty]
+        self.spawn_chance = spawn_settings['spawn_chance']
+        self.spawn_count = spawn_settings['spawn_count']
+
+        # Define movement speed
+        self.MOVE_SPEED = 12  # px/step; adjust this value as needed
+
+        # Define battery drain rate
+        self.BATTERY_DRAIN = 0.125  # Per step; adjust as needed
+
+        # Minimum pixel distance between a new IED and the player
+        self.IED_MIN_DISTANCE = 200
+
+        for name, value in (tuning or {}).items():
+            if name not in TUNABLE:
+                raise ValueError(f"Unknown tuning parameter: {name}")
+            setattr(self, name, value)
+
+        # Initialize IED position
+        self.ied_pos = None
+        self.proximity = None  # Closeness grid, built by place_ied()
+        self.beep_countdown = 0  # Steps until the next detector beep
+        self.beep_steps_left = 0  # Steps left in the current beep
+        self.place_ied()  # Place the IED on the grid
+
+        # Falling obstacles, stored as position/type arrays. A field from
+        # an earlier round can be passed in to reuse its slots.
+        if obstacles is None:
+            obstacles = ObstacleField(self.OBSTACLE_SIZE)
+        else:
+            obstacles.clear()
+        self.obstacles = obstacles
+
+        # The sprites' shapes, which decide every hit
+        if hit_masks is None:
+            hit_masks = default_hit_masks()
+        self.hit_masks = hit_masks
+        log.info("IED Minigame started with %d lives", self.lives)
+
+    def switch_sprite(self):
+        """Switch between robot and bomb suit sprites"""
+        if self.current_sprite == "robot":
+            self.current_sprite = "bombsuit"
+            log.info("Switched to Bomb Suit - Watch your morale!")
+        else:
+            self.current_sprite = "robot"
+            log.info("Switched to Talon Robot - Watch your battery!")
+
+    def check_collision_with_obstacles(self):
+        """Check if player has collided with any falling obstacles"""
+        hit = self.hit_masks.obstacle_hit(
+            self.player_pos[0], self.player_pos[1], self.obstacles)
+        if hit >= 0:
+            collision_log.info("Collision detected with obstacle at %s",
+                               self.obstacles.position(hit))
+            self.game_over = True
+            self.success = False
+            return True
+        return False
+
+    def check_ied_collision(self):
+        """Check if player has found the IED"""
+        if self.hit_masks.ied_hit(self.player_pos[0], self.player_pos[1],
+                                  *self.ied_pos):
+            collision_log.info("IED found at %s", self.ied_pos)
+            self.game_over = True
+            self.success = True
+            return True
+        return False
+
+    def begin_step(self):
+        """Remember the player's position before this step's input"""
+        self.prev_player_pos = self.player_pos
+
+    def update(self):
+        """Update the game state"""
+        if self.game_over:
+            return
+
+        # Check for IED collision first
+        if self.check_ied_collision():
+            return
+
+        # Move all obstacles and remove those that are off screen
+        self.obstacles.advance(self.FALL_SPEED, self.height)
+
+        # Spawn new obstacles
+        # Increased range from 1-30 to 1-40 to reduce spawn rate by 25%
+        if self.rng.randint(1, self.spawn_chance) == 1:
+            for _ in range(self.spawn_count):
+                self.spawn_obstacle()
+
+        # Check for collisions
+        if self.check_collision_with_obstacles():
+            self.lose_life()
+            return
+
+        # Update battery drain
+        self.battery -= self.BATTERY_DRAIN
+        if self.battery <= 0:
+            log.info("Game Over: Battery depleted")
+            self.lose_life()
+            return
+
+        self.update_detector()
+
+    def update_detector(self):
+        """Count down to the next detector beep"""
+        if self.beep_steps_left:
+            self.beep_steps_left -= 1
+        self.beep_countdown -= 1
+        if self.beep_countdown <= 0:
+            self.beep_steps_left = BEEP_STEPS
+            self.beep_countdown = BEEP_INTERVALS[self.player_proximity()]
+
+    @property
+    def beeping(self):
+        return self.beep_steps_left > 0
+
+    def build_proximity_field(self):
+        """Grid the screen's closeness to the IED, from 0 to 255"""
+        cell = PROXIMITY_CELL
+        rows = -(-self.height // cell)
+        cols = -(-self.width // cell)
+        # Distances from each cell's centre to the IED's centre
+        half = self.IED_SIZE / 2
+        dx = (np.arange(cols) + 0.5) * cell - (self.ied_pos[0] + half)
+        dy = (np.arange(rows) + 0.5) * cell - (self.ied_pos[1] + half)
+        distance = np.hypot(dx[np.newaxis, :], dy[:, np.newaxis])
+        max_distance = np.hypot(self.width, self.height)
+        closeness = 255 * (1 - np.minimum(distance / max_distance, 1))
+        self.proximity = closeness.astype(np.uint8)
+
+    def proximity_at(self, x, y):
+        """Return the closeness (0-255) to the IED at a screen point"""
+        rows, cols = self.proximity.shape
+        row = min(max(int(y) // PROXIMITY_CELL, 0), rows - 1)
+        col = min(max(int(x) // PROXIMITY_CELL, 0), cols - 1)
+        return int(self.proximity[row, col])
+
+    def player_proximity(self):
+        """Return the closeness (0-255) of the player's centre to the IED"""
+        half = self.PLAYER_SIZE // 2
+        return self.proximity_at(
+            self.player_pos[0] + half, self.player_pos[1] + half)
+
+    def lose_life(self):
+        """Handle losing a life"""
+        self.lives -= 1  # Decrement lives first
+        log.info("Life lost in minigame. Lives remaining: %d", self.lives)
+        self.game_over = True
+        self.success = False
+
+    def reset_game(self):
+        """Reset the game state for another attempt"""
+        self.battery = 100  # Reset battery to full
+        # Reset player position
+        self.player_pos = [(self.width // 2) - 60, (self.height // 2) - 60]
+        self.prev_player_pos = self.player_pos
+        self.obstacles.clear()  # Clear all obstacles
+        self.place_ied()  # Place a new IED
+        self.game_over = False  # Reset game_over flag
+        self.success = False  # Reset success flag
+
+    def move_player(self, dx, dy):
+        """Move the player and check for collisions"""
+        if self.game_over:
+            return
+
+        new_x = self.player_pos[0] + dx * self.MOVE_SPEED
+        new_y = self.player_pos[1] + dy * self.MOVE_SPEED
+
+        # Check boundaries
+        if (0 <= new_x < self.width - self.PLAYER_SIZE
+                and 0 <= new_y < self.height - self.PLAYER_SIZE):
+            self.player_pos = [new_x, new_y]
+            move_log.debug("Player moved to [%s, %s]", new_x, new_y)
+
+            # Check IED collision immediately after movement
+            if self.check_ied_collision():
+                return
+
+            # Check for obstacle collisions
+            if self.check_collision_with_obstacles():
+                return
+
+    def place_ied(self):
+        """Place IED at a random screen location.
+
+        Ensures a minimum distance from the player.
+        """
+        min_distance = self.IED_MIN_DISTANCE
+        while True:
+            x = self.rng.randint(0, self.width - self.IED_SIZE)
+            y = self.rng.randint(0, self.height - self.IED_SIZE)
+
+            # Calculate distance between proposed IED position and player
+            distance = ((x - self.player_pos[0]) **
+                        2 + (y - self.player_pos[1])**2)**0.5
+
+            # Only place IED if it's far enough from player
+            if distance >= min_distance:
+                self.ied_pos = [x, y]
+                log.info("IED placed at (%d, %d), distance from player: %.0f",
+                         x, y, distance)
+                break
+        self.build_proximity_field()
+        self.beep_countdown = 0  # Beep straight away for the new IED
+
+    def spawn_obstacle(self):
+        """Spawn new falling obstacle at random x position"""
+        x = self.rng.randint(0, self.width - self.OBSTACLE_SIZE)
+
+        # Spawn TNT only if not in operator mode.
+        # Spawn both TNT and Doge if operator mode is enabled.
+        if self.operator_mode:
+            kind = self.rng.choice([TNT, DOGE])
+        else:
+            kind = TNT
+
+        self.obstacles.spawn(x, -self.OBSTACLE_SIZE, kind)
+        spawn_log.debug("Spawned obstacle: %s at x=%d",
+                        OBSTACLE_TYPES[kind], x)
+
+    def check_collision(self, pos1, pos2):
+        """Check if two positions are close enough to collide"""
+        return (abs(pos1[0] - pos2[0]) < 40 and
+                abs(pos1[1] - pos2[1]) < 40)
@@ -0,0 +1,190 @@
+import numpy as np
+
+
+# Obstacle type tags, indexed by the values stored in ObstacleField.kind
+OBSTACLE_TYPES = ('tnt', 'doge')
+TNT = 0
+DOGE = 1
+
+# Below this many obstacles a full vectorised test is cheaper than the
+# broadphase (measured crossover is around 4-5k obstacles)
+BROADPHASE_MIN_COUNT = 4096
+
+
+class ObstacleField:
+    """Falling obstacles stored as contiguous struct-of-arrays.
+
+    Positions live in float64 arrays and types in a uint8 array; only the
+    first ``count`` slots are live. Movement, culling and collision tests
+    are done for the whole field at once with NumPy.
+
+    Collision tests on large fields use a row-band broadphase. Every
+    obstacle falls by the same amount each frame, so ``scroll - y`` is
+    fixed for an obstacle's lifetime. It is stored in ``fall_key``, and
+    while obstacles are spawned no lower than the previous one the keys
+    stay sorted. A box then only needs a narrow-phase test against the
+    contiguous slice found by two binary searches, with no per-frame
+    bookkeeping as obstacles fall.
+
+    The arrays are a pool: slots freed by culling are reused by later
+    spawns, and a field can be clear()ed and reused for the next round,
+    so the arrays are only reallocated when the field outgrows them.
+    ``spawned``, ``grows`` and ``peak`` count spawns, reallocations and
+    the most slots ever live.
+    """
+
+    def __init__(self, size, capacity=64, broadphase=True):
+        self.size = size
+        self.count = 0
+        self.x = np.empty(capacity, dtype=np.float64)
+        self.y = np.empty(capacity, dtype=np.float64)
+        self.kind = np.empty(capacity, dtype=np.uint8)
+        self.fall_key = np.empty(capacity, dtype=np.float64)
+
+        self.broadphase = broadphase
+        self.scroll = 0.0  # Total distance fallen since the last clear()
+        self.keys_sorted = True
+
+        self.spawned = 0
+        self.grows = 0
+        self.peak = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def _reserve(self, needed):
+        """Grow the backing arrays so at least `needed` slots fit"""
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, self.capacity * 2)
+        self.grows += 1
+        for name in ('x', 'y', 'kind', 'fall_key'):
+            old = getattr(self, name)
+            grown = np.empty(new_capacity, dtype=old.dtype)
+            grown[:self.count] = old[:self.count]
+            setattr(self, name, grown)
+
+    def spawn(self, x, y, kind=TNT):
+        """Append one obstacle"""
+        self._reserve(self.count + 1)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.kind[i] = kind
+        key = self.scroll - y
+        if i and key < self.fall_key[i - 1]:
+            self.keys_sorted = False
+        self.fall_key[i] = key
+        self.count += 1
+        self.spawned += 1
+        if self.count > self.peak:
+            self.peak = self.count
+
+    def clear(self):
+        """Remove all obstacles, keeping the allocated arrays"""
+        self.count = 0
+        self.scroll = 0.0
+        self.keys_sorted = True
+
+    def advance(self, dy, limit):
+        """Move every obstacle down by dy and cull those past `limit`.
+
+        Returns the number of obstacles removed.
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        y = self.y[:n]
+        y += dy
+        self.scroll += dy
+
+        if self.keys_sorted:
+            # Lowest first, so the culled obstacles are a prefix and the
+            # survivors just shift down, without temporary arrays
+            removed = int(np.searchsorted(
+                self.fall_key[:n], self.scroll - limit, side='left'))
+            if removed:
+                kept = n - removed
+                for array in (self.x, self.y, self.kind, self.fall_key):
+                    array[:kept] = array[removed:n]
+                self.count = kept
+            return removed
+
+        keep = y <= limit
+        kept = int(np.count_nonzero(keep))
+        removed = n - kept
+        if removed:
+            # Compact survivors to the front, preserving spawn order
+            self.x[:kept] = self.x[:n][keep]
+            self.y[:kept] = y[keep]
+            self.kind[:kept] = self.kind[:n][keep]
+            self.fall_key[:kept] = self.fall_key[:n][keep]
+            self.count = kept
+        return removed
+
+    def _overlaps(self, x, y, width, height, size):
+        """Return (lo, hits): which of slots lo.. overlap a box"""
+        n = self.count
+        lo = 0
+        hi = n
+        if (self.broadphase and self.keys_sorted
+                and n >= BROADPHASE_MIN_COUNT):
+            # Obstacles with y in (y - size, y + height), as a key range
+            keys = self.fall_key[:n]
+            lo = int(np.searchsorted(keys, self.scroll - (y + height),
+                                     side='right'))
+            hi = int(np.searchsorted(keys, self.scroll - (y - size),
+                                     side='left'))
+            hi = max(lo, hi)
+
+        # Narrow phase on the band only
+        ox = self.x[lo:hi]
+        oy = self.y[lo:hi]
+        hits = ((ox < x + width) & (x < ox + size)
+                & (oy < y + height) & (y < oy + size))
+        return lo, hits
+
+    def first_hit(self, x, y, width, height, size=None):
+        """Return the index of the first obstacle overlapping a box, or -1.
+
+        Obstacles are `size` square (the field's size by default).
+        """
+        if self.count == 0:
+            return -1
+        lo, hits = self._overlaps(
+            x, y, width, height, self.size if size is None else size)
+        if not hits.size:
+            return -1
+        index = int(np.argmax(hits))
+        return lo + index if hits[index] else -1
+
+    def overlapping(self, x, y, width, height, size=None):
+        """Return the indices of every obstacle overlapping a box"""
+        if self.count == 0:
+            return ()
+        lo, hits = self._overlaps(
+            x, y, width, height, self.size if size is None else size)
+        return (lo + np.flatnonzero(hits)).tolist()
+
+    def type_of(self, index):
+        """Return the type tag of the obstacle at `index`"""
+        return OBSTACLE_TYPES[self.kind[index]]
+
+    def position(self, index):
+        """Return the [x, y] position of the obstacle at `index`"""
+        return [float(self.x[index]), float(self.y[index])]
+
+    def live(self):
+        """Return views of the live obstacles' x, y and kind arrays"""
+        n = self.count
+        return self.x[:n], self.y[:n], self.kind[:n]
+
+    def items(self):
+        """Return (x, y, kind) tuples for every live obstacle"""
+        n = self.count
+        return zip(self.x[:n].tolist(), self.y[:n].tolist(),
+                   self.kind[:n].tolist())
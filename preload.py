@@ -0,0 +1,114 @@
+import queue
+import threading
+import time
+
+
+class Preloader:
+    """Loads upcoming assets in the background.
+
+    A worker thread decodes images and music tracks. Decoded results
+    are queued, and pump() hands them to the AssetLoader/MusicManager on
+    the main thread, since display-format conversion must happen there.
+    """
+
+    def __init__(self, asset_loader, music_manager):
+        self.asset_loader = asset_loader
+        self.music_manager = music_manager
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.total = 0
+        self.done = 0
+        self.queued = set()  # Keys already queued, loaded or not
+        self.worker = None
+
+    def add_image(self, filename, size=None, scale_factor=1,
+                  fallback_color=None):
+        """Queue an image for AssetLoader.load_image/load_sprite"""
+        cache_key = (filename, size, scale_factor)
+        loader = self.asset_loader
+        if cache_key in self.queued or cache_key in loader.cached_images or (
+                loader.pack is not None and cache_key in loader.pack):
+            return  # Already cheap to get
+        self._add(('image', cache_key, fallback_color))
+
+    def add_sprites(self, sprite_specs):
+        """Queue a table of AssetLoader.load_sprite argument tuples"""
+        for filename, color, size, scale_factor in sprite_specs.values():
+            self.add_image(filename, size, scale_factor, color)
+
+    def add_music(self, track_key):
+        """Queue a music track to be decoded into memory"""
+        music_manager = self.music_manager
+        if (track_key in self.queued or track_key in music_manager.sounds
+                or track_key in music_manager.decoding):
+            return
+        self._add(('music', track_key, None))
+
+    def _add(self, job):
+        self.queued.add(job[1])
+        self.total += 1
+        self.jobs.put(job)
+        if self.worker is None:
+            self.worker = threading.Thread(
+                target=self._work, name="preloader", daemon=True)
+            self.worker.start()
+
+    def _work(self):
+        """Worker thread: decode queued jobs forever"""
+        while True:
+            kind, key, fallback_color = job = self.jobs.get()
+            try:
+                if kind == 'image':
+                    filename, size, scale_factor = key
+                    data = self.asset_loader.decode(
+                        filename, size, scale_factor)
+                else:
+                    data = self.music_manager.decode_track(key)
+            except Exception:
+                # Let the main thread's normal loader report the error
+                data = None
+            self.results.put((job, data))
+
+    def _finish(self, job, data):
+        """Main thread: hand one decoded result to its manager"""
+        kind, key, fallback_color = job
+        if kind == 'music':
+            if data is not None:
+                self.music_manager.store_track(key, data)
+        elif data is not None:
+            self.asset_loader.store(key, data)
+        else:
+            filename, size, scale_factor = key
+            if fallback_color is None:
+                self.asset_loader.load_image(filename, size)
+            else:
+                self.asset_loader.load_sprite(
+                    filename, fallback_color, size, scale_factor)
+        self.done += 1
+
+    def pump(self, budget_ms=4):
+        """Finish decoded assets on the main thread for up to budget_ms"""
+        deadline = time.perf_counter() + budget_ms / 1000
+        while self.done < self.total:
+            try:
+                job, data = self.results.get_nowait()
+            except queue.Empty:
+                return
+            self._finish(job, data)
+            if time.perf_counter() >= deadline:
+                return
+
+    def finish(self):
+        """Block until every queued asset is loaded"""
+        while self.done < self.total:
+            job, data = self.results.get()
+            self._finish(job, data)
+
+    @property
+    def progress(self):
+        """Fraction of queued assets that are ready, from 0.0 to 1.0"""
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def ready(self):
+        return self.done >= self.total
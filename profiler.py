@@ -0,0 +1,259 @@
+import gc
+import json
+import time
+from collections import deque
+
+import pygame
+
+
+# Upper edges (ms) of the session histogram buckets; the last is open
+HISTOGRAM_EDGES_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3, 50, 100)
+
+
+class PhaseStats:
+    """Timings for one named phase.
+
+    Keeps a rolling window of recent samples for live percentiles plus a
+    bucketed histogram, count, total and worst over the whole session.
+    """
+
+    def __init__(self, window):
+        self.recent = deque(maxlen=window)
+        self.histogram = [0] * (len(HISTOGRAM_EDGES_MS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.worst_ns = 0
+
+    def add(self, elapsed_ns):
+        self.recent.append(elapsed_ns)
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.worst_ns:
+            self.worst_ns = elapsed_ns
+
+        elapsed_ms = elapsed_ns / 1e6
+        bucket = 0
+        for edge in HISTOGRAM_EDGES_MS:
+            if elapsed_ms <= edge:
+                break
+            bucket += 1
+        self.histogram[bucket] += 1
+
+    def summary(self):
+        """Return rolling p50/p95/p99 and session mean/worst, in ms"""
+        recent = sorted(self.recent)
+        if not recent:
+            return {}
+
+        def percentile(p):
+            return recent[min(len(recent) - 1, int(p * len(recent)))] / 1e6
+
+        return {
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'worst': self.worst_ns / 1e6,
+            'mean': self.total_ns / self.count / 1e6,
+            'count': self.count,
+        }
+
+
+class _Phase:
+    """Reusable context manager that times one phase"""
+
+    __slots__ = ('profiler', 'stats', 'start')
+
+    def __init__(self, profiler, stats):
+        self.profiler = profiler
+        self.stats = stats
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.profiler.enabled:
+            self.stats.add(time.perf_counter_ns() - self.start)
+
+
+class FrameProfiler:
+    """Times each phase of the main loop with a high-resolution clock.
+
+    Use `with profiler.phase("update"):` around a phase, and
+    begin_frame()/end_frame() around a whole frame ("frame" phase).
+    """
+
+    def __init__(self, window=600, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.phases = {}
+        self._timers = {}
+        self._frame_start = None
+        self.started = time.time()
+
+    def stats(self, name):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats(self.window)
+        return stats
+
+    def phase(self, name):
+        """Return a context manager that times the named phase"""
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = _Phase(self, self.stats(name))
+        return timer
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if self.enabled and self._frame_start is not None:
+            self.stats('frame').add(
+                time.perf_counter_ns() - self._frame_start)
+
+    def summary(self):
+        """Return {phase: stats summary} for every phase seen"""
+        return {
+            name: stats.summary()
+            for name, stats in self.phases.items()
+            if stats.count
+        }
+
+    def export_json(self, path):
+        """Write the session's timings to a JSON file"""
+        report = {
+            'started': self.started,
+            'duration_s': time.time() - self.started,
+            'histogram_edges_ms': list(HISTOGRAM_EDGES_MS),
+            'phases': {
+                name: dict(stats.summary(), histogram=stats.histogram)
+                for name, stats in self.phases.items()
+                if stats.count
+            },
+        }
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+class GCMonitor:
+    """Times garbage collections and keeps long-lived objects out of them.
+
+    Each collection is timed into the profiler as a "gc.gen<N>" phase.
+    freeze() moves every tracked object into the permanent generation, so
+    collections during a round no longer scan the long-lived assets and
+    caches; thaw() undoes it. It does not collect first, which would stall
+    the frame it is called on; garbage frozen with the rest is collected
+    after thaw().
+    """
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        # Made up front: the callback should not allocate mid-collection
+        self.generations = [profiler.stats(f"gc.gen{generation}")
+                            for generation in range(3)]
+        self.collections = [0, 0, 0]
+        self.frozen = False
+        self._start = 0
+        gc.callbacks.append(self._callback)
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter_ns()
+            return
+        generation = info["generation"]
+        self.collections[generation] += 1
+        if self.profiler.enabled:
+            self.generations[generation].add(
+                time.perf_counter_ns() - self._start)
+
+    def freeze(self):
+        """Exempt every tracked object from collection until thaw()"""
+        if not self.frozen:
+            gc.freeze()
+            self.frozen = True
+
+    def thaw(self):
+        if self.frozen:
+            gc.unfreeze()
+            self.frozen = False
+
+    def close(self):
+        """Thaw and stop timing collections"""
+        self.thaw()
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+
+class PerfOverlay:
+    """Toggleable on-screen table of FrameProfiler percentiles.
+
+    Counters added with add_counter() are listed below the phases with
+    their current value and rate of change.
+    """
+
+    # Re-render the table only this often, in frames
+    REFRESH_FRAMES = 30
+
+    def __init__(self, profiler, font):
+        self.profiler = profiler
+        self.font = font
+        self.visible = False
+        self.panel = None
+        self.frames_until_refresh = 0
+        self.counters = {}  # Label -> callable returning a number
+        self.last_counts = {}  # Label -> (value, perf_counter time)
+
+    def add_counter(self, label, read):
+        """List `read()` and its change per second on the overlay"""
+        self.counters[label] = read
+
+    def counter_lines(self):
+        lines = []
+        now = time.perf_counter()
+        for label, read in self.counters.items():
+            value = read()
+            last_value, last_time = self.last_counts.get(label, (value, now))
+            elapsed = now - last_time
+            rate = (value - last_value) / elapsed if elapsed else 0.0
+            self.last_counts[label] = (value, now)
+            lines.append(f"{label[:14]:<14} {value:8d} {rate:10.1f}/s")
+        return lines
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.frames_until_refresh = 0
+
+    def render_panel(self):
+        """Render the current stats table to a translucent surface"""
+        lines = ["phase            p50    p95    p99  worst (ms)"]
+        for name, stats in sorted(self.profiler.summary().items()):
+            lines.append(
+                f"{name[:14]:<14} {stats['p50']:6.2f} {stats['p95']:6.2f} "
+                f"{stats['p99']:6.2f} {stats['worst']:6.2f}"
+            )
+        if self.counters:
+            lines.append("counter           value       rate")
+            lines.extend(self.counter_lines())
+        rendered = [self.font.render(line, True, (0, 255, 0))
+                    for line in lines]
+        line_height = self.font.get_linesize()
+        width = max(text.get_width() for text in rendered) + 16
+        height = line_height * len(rendered) + 16
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for i, text in enumerate(rendered):
+            panel.blit(text, (8, 8 + i * line_height))
+        return panel
+
+    def draw(self, surface):
+        """Draw the overlay if visible; return the rect drawn, or None"""
+        if not self.visible:
+            return None
+        if self.frames_until_refresh <= 0 or self.panel is None:
+            self.panel = self.render_panel()
+            self.frames_until_refresh = self.REFRESH_FRAMES
+        self.frames_until_refresh -= 1
+        return surface.blit(self.panel, (10, 10))
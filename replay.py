@@ -0,0 +1,198 @@
+"""Deterministic input recording and replay.
+
+A Recording holds everything needed to reproduce a session exactly: the
+seed of the game's RNG, the sim steps at which menu commands were given,
+and the minigame input bitmask (MinigameScreen.INPUT_*) of every minigame
+step, run-length encoded. Play is stepped at a fixed rate from simulated
+time only, so feeding these back in gives a bit-exact rerun.
+
+`python replay.py session.rec` replays a recording headlessly with
+rendering off and no frame cap, and prints the outcome and speed.
+
+File layout (little-endian):
+    MAGIC | seed u64 | step_hz u16 | steps u32 | difficulty (u8 length +
+    ASCII) | command count u32 | (step u32, command u8)... |
+    input run count u32 | (length u16, input mask u8)...
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+
+
+MAGIC = b"BSTREC01"
+_HEADER = struct.Struct("<8sQHI")
+_COUNT = struct.Struct("<I")
+_COMMAND = struct.Struct("<IB")
+_RUN = struct.Struct("<HB")
+_MAX_RUN = 0xFFFF
+
+# Menu commands, recorded with the step they were given at
+COMMAND_START = 1
+COMMAND_START_OPERATOR = 2
+COMMAND_QUIT = 3
+
+
+class Recording:
+    """One session's seed, menu commands and minigame input"""
+
+    def __init__(self, seed, difficulty='normal', step_hz=60):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.step_hz = step_hz
+        self.steps = 0  # Length of the session in sim steps
+        self.commands = []  # (step, COMMAND_*) pairs
+        self.input_runs = []  # [length, input mask] pairs
+
+    def add_command(self, step, command):
+        self.commands.append((step, command))
+
+    def add_input(self, input_mask):
+        """Append one minigame step's input bitmask"""
+        runs = self.input_runs
+        if runs and runs[-1][1] == input_mask and runs[-1][0] < _MAX_RUN:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, input_mask])
+
+    def inputs(self):
+        """Yield every recorded input bitmask in order"""
+        for length, input_mask in self.input_runs:
+            for _ in range(length):
+                yield input_mask
+
+    def to_bytes(self):
+        difficulty = self.difficulty.encode("ascii")
+        parts = [
+            _HEADER.pack(MAGIC, self.seed, self.step_hz, self.steps),
+            bytes([len(difficulty)]), difficulty,
+            _COUNT.pack(len(self.commands)),
+        ]
+        parts.extend(_COMMAND.pack(step, command)
+                     for step, command in self.commands)
+        parts.append(_COUNT.pack(len(self.input_runs)))
+        parts.extend(_RUN.pack(length, input_mask)
+                     for length, input_mask in self.input_runs)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, seed, step_hz, steps = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("not an input recording")
+        offset = _HEADER.size
+        length = data[offset]
+        difficulty = data[offset + 1:offset + 1 + length].decode("ascii")
+        offset += 1 + length
+
+        recording = cls(seed, difficulty, step_hz)
+        recording.steps = steps
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        for _ in range(count):
+            recording.commands.append(_COMMAND.unpack_from(data, offset))
+            offset += _COMMAND.size
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        for _ in range(count):
+            recording.input_runs.append(list(_RUN.unpack_from(data, offset)))
+            offset += _RUN.size
+        return recording
+
+    def save(self, path):
+        with open(path, "wb") as recording_file:
+            recording_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as recording_file:
+            return cls.from_bytes(recording_file.read())
+
+
+class Replayer:
+    """Feeds a Recording's input back to a GameManager"""
+
+    def __init__(self, recording):
+        self.recording = recording
+        self._inputs = recording.inputs()
+        self._commands = list(reversed(recording.commands))
+
+    def next_input(self):
+        """Return the next minigame input bitmask (0 once they run out)"""
+        return next(self._inputs, 0)
+
+    def commands_due(self, step):
+        """Return the commands given at or before `step`, in order"""
+        due = []
+        while self._commands and self._commands[-1][0] <= step:
+            due.append(self._commands.pop()[1])
+        return due
+
+
+def apply_command(game_manager, command):
+    if command == COMMAND_QUIT:
+        game_manager.quit()
+    else:
+        game_manager.start_mission(command == COMMAND_START_OPERATOR)
+
+
+def replay(recording, asset_loader, music_manager, font_manager,
+           width=1024, height=768, **options):
+    """Play a Recording on a new GameManager and return the manager.
+
+    Runs one sim step per frame as fast as possible without drawing.
+    Extra options are passed on to GameManager.
+    """
+    from game_manager import GameManager
+
+    game_manager = GameManager(
+        width, height, asset_loader, music_manager, font_manager,
+        difficulty=recording.difficulty, seed=recording.seed, **options)
+    replayer = game_manager.replayer = Replayer(recording)
+    step_ms = game_manager.timestep.step_ms
+
+    while game_manager.running and \
+            game_manager.timestep.steps < recording.steps:
+        for command in replayer.commands_due(game_manager.timestep.steps):
+            apply_command(game_manager, command)
+        game_manager.update(step_ms)
+    game_manager.gc_monitor.close()
+    return game_manager
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay an input recording headlessly")
+    parser.add_argument("recording")
+    parser.add_argument("--profile",
+                        help="write per-phase timings to this JSON file")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from utils import AssetLoader, MusicManager, FontManager
+
+    pygame.init()
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    recording = Recording.load(args.recording)
+
+    start = time.perf_counter()
+    game_manager = replay(
+        recording, AssetLoader(base_path), MusicManager(base_path),
+        FontManager(base_path))
+    elapsed = time.perf_counter() - start
+
+    session_s = recording.steps / recording.step_hz
+    print(f"Replayed {recording.steps} steps ({session_s:.1f}s of play) "
+          f"in {elapsed:.2f}s, {session_s / elapsed:.0f}x real time")
+    print(f"Final state: {game_manager.current_state.name}, "
+          f"{game_manager.game_data}")
+    if args.profile:
+        game_manager.profiler.export_json(args.profile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,51 @@
 import pygame
 import math  # Add this import
-from utils import draw_text
-from game import IEDMiniGame  # Add this import at the top
+from utils import draw_text, text_cache
+from dirty_rects import DirtyRectTracker
+from gamelog import get_logger
+from game import IEDMiniGame, MinigameRenderer
+import minigame_sim
+from minigame_sim import MinigameSim
+
+
+log = get_logger("screens")
 
 
 class ScreenBase:
     def __init__(
-        self, width, height, asset_loader, font_manager, music_manager
+        self, width, height, asset_loader, font_manager, music_manager,
+        scale=1.0
     ):
-        self.width = width
-        self.height = height
+        # Layout is designed for width x height. With a render scale
+        # below 1 the screen draws into a smaller internal surface of
+        # the scaled size, and px() scales the layout's pixel lengths.
+        self.scale = scale
+        self.layout_size = (width, height)
+        self.width = round(width * scale)
+        self.height = round(height * scale)
         self.asset_loader = asset_loader
         self.font_manager = font_manager
         self.music_manager = music_manager
+        self.dirty = DirtyRectTracker(self.width, self.height)
+        # How far between the last two sim steps to draw (see timestep.py)
+        self.alpha = 1.0
+
+    def draw_dirty(self, surface, game_data, full=False):
+        """Draw the screen and return the rects that need updating.
+
+        Screens that override this only redraw what changed since the
+        previous call; `full` forces a complete redraw.
+        """
+        self.draw(surface, game_data)
+        return [surface.get_rect()]
+
+    def px(self, length):
+        """Scale a layout length in pixels to the render resolution"""
+        return round(length * self.scale)
+
+    @classmethod
+    def queue_preload(cls, preloader, width, height, scale=1.0):
+        """Queue this screen's assets on a preload.Preloader"""
 
 
 class MenuScreen(ScreenBase):
@@ -23,14 +56,20 @@ class MenuScreen(ScreenBase):
             (self.width, self.height)
         )
         self.code_input = ""
-        self.code_font = pygame.font.SysFont("consolas", 24)
+        self.code_font = self.font_manager.font(24)
         self.input_active = False
-        self.input_rect = pygame.Rect(self.width - 150, 20, 130, 32)
+        self.input_rect = pygame.Rect(
+            self.width - self.px(150), self.px(20), self.px(130),
+            self.px(32))
+        self.preloader = None  # Set by GameManager to show load progress
+        self.drawn_state = None  # Dynamic state at the last dirty draw
 
     def handle_input(self, event):
         """Handle code input"""
         if event.type == pygame.MOUSEBUTTONDOWN:
-            if self.input_rect.collidepoint(event.pos):
+            # Mouse positions are in display pixels
+            x, y = event.pos
+            if self.input_rect.collidepoint(self.px(x), self.px(y)):
                 self.input_active = True
             else:
                 self.input_active = False
@@ -46,6 +85,32 @@ class MenuScreen(ScreenBase):
 
     def draw(self, surface, game_data):  # Added game_data parameter
         """Draw the menu screen"""
+        self.draw_static(surface)
+        self.draw_dynamic(surface)
+
+    def draw_dirty(self, surface, game_data, full=False):
+        """Redraw only the code box and load progress when they change"""
+        if self.dirty.needs_static():
+            self.dirty.build_static(surface, self.draw_static)
+            full = True
+
+        state = (self.code_input, self.input_active, self.progress_text())
+        if not full and state == self.drawn_state:
+            return []
+        self.drawn_state = state
+
+        self.dirty.begin(surface, full)
+        self.dirty.extend(self.draw_dynamic(surface))
+        return self.dirty.end()
+
+    def progress_text(self):
+        """Return the load progress line, or None once loading is done"""
+        if self.preloader and not self.preloader.ready:
+            return f"Preparing gear... {self.preloader.progress:.0%}"
+        return None
+
+    def draw_static(self, surface):
+        """Draw the background and menu options"""
         if self.background:
             surface.blit(self.background, (0, 0))
 
@@ -66,72 +131,126 @@ class MenuScreen(ScreenBase):
                 self.font_manager.get_font('small'),
                 text_color,
                 self.width // 2,
-                self.height // 2 + (i * 40)
+                self.height // 2 + i * self.px(40)
             )
 
+    def draw_dynamic(self, surface):
+        """Draw the code input box and load progress; return their rects"""
         # Draw code input box
         color = (255, 255, 255) if self.input_active else (128, 128, 128)
-        pygame.draw.rect(surface, color, self.input_rect, 2)
+        rects = [pygame.draw.rect(surface, color, self.input_rect, 2)]
 
         # Draw masked code input (show asterisks)
         masked_input = "*" * len(self.code_input)
-        text_surface = self.code_font.render(
-            masked_input, True, (255, 255, 255))
-        surface.blit(text_surface, (self.input_rect.x +
-                     5, self.input_rect.y + 5))
+        text_surface = text_cache.render(
+            self.code_font, masked_input, (255, 255, 255))
+        rects.append(surface.blit(
+            text_surface,
+            (self.input_rect.x + self.px(5), self.input_rect.y + self.px(5))))
+
+        # Show background loading progress until the mission is ready
+        progress_text = self.progress_text()
+        if progress_text:
+            rects.append(draw_text(
+                surface,
+                progress_text,
+                self.font_manager.get_font('small'),
+                (128, 128, 128),
+                self.width // 2,
+                self.height - self.px(40)
+            ))
+        return rects
 
 
 class TravelScreen(ScreenBase):
+    BACKGROUND = "traveling_background.png"
+    TRUCK = "mrap_truck_right_facing.png"
+    TRUCK_SIZE = (240, 160)  # Reduced size for better visibility
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.background = self.asset_loader.load_image(
-            "traveling_background.png",
+            self.BACKGROUND,
             (self.width, self.height)
         )
+        self.truck_size = self.truck_size_at(self.scale)
         self.truck = self.asset_loader.load_image(
-            "mrap_truck_right_facing.png",
-            (240, 160)  # Reduced size for better visibility
+            self.TRUCK,
+            self.truck_size
         )
-        self.truck_x = -240  # Match new truck width
+        self.truck_x = -self.truck_size[0]  # Match new truck width
+        self.prev_truck_x = self.truck_x
         # Adjusted for better vertical position
-        self.truck_y = self.height // 2 - 80
+        self.truck_y = self.height // 2 - self.px(80)
+        self.truck_speed = 3 * self.scale  # Slightly increased (px/step)
+        self.bounce_height = 5 * self.scale
         self.bounce_offset = 0
         self.bounce_speed = 0.005  # Reduced for smoother animation
+        self.bounce_time = 0  # Simulated ms driving the bounce
+
+    @classmethod
+    def truck_size_at(cls, scale):
+        return (round(cls.TRUCK_SIZE[0] * scale),
+                round(cls.TRUCK_SIZE[1] * scale))
+
+    @classmethod
+    def queue_preload(cls, preloader, width, height, scale=1.0):
+        """Queue this screen's assets on a preload.Preloader"""
+        preloader.add_image(
+            cls.BACKGROUND, (round(width * scale), round(height * scale)))
+        preloader.add_image(cls.TRUCK, cls.truck_size_at(scale))
+        preloader.add_music('travel')
 
     def update(self):
-        """Update truck position and animation"""
-        self.truck_x += 3  # Slightly increased speed
+        """Advance the truck animation by one sim step"""
+        self.prev_truck_x = self.truck_x
+        self.truck_x += self.truck_speed
         if self.truck_x > self.width:
-            self.truck_x = -240
+            self.truck_x = -self.truck_size[0]
+            self.prev_truck_x = self.truck_x  # Don't sweep back across
 
+        self.bounce_time += 1000 / MinigameSim.STEP_HZ
         self.bounce_offset = math.sin(
-            pygame.time.get_ticks() * self.bounce_speed) * 5
+            self.bounce_time * self.bounce_speed) * self.bounce_height
 
     def draw(self, surface, game_data):
         """Draw the travel screen"""
+        self.draw_static(surface, self.status_text(game_data))
+        self.draw_dynamic(surface, game_data)
+
+    def draw_dirty(self, surface, game_data, full=False):
+        """Redraw only the truck and points over the cached background"""
+        status_text = self.status_text(game_data)
+        if self.dirty.needs_static(status_text):
+            self.dirty.build_static(
+                surface,
+                lambda layer: self.draw_static(layer, status_text),
+                status_text
+            )
+            full = True
+
+        self.dirty.begin(surface, full)
+        self.dirty.extend(self.draw_dynamic(surface, game_data))
+        return self.dirty.end()
+
+    def status_text(self, game_data):
+        return (f"Fuel: {game_data['fuel']} | "
+                f"Battery: {game_data['battery']} | "
+                f"Morale: {game_data['morale']}")
+
+    def draw_static(self, surface, status_text):
+        """Draw the background and status lines"""
         # Draw background
         if self.background:
             surface.blit(self.background, (0, 0))
 
-        # Draw truck with bounce effect
-        if self.truck:
-            surface.blit(
-                self.truck,
-                (self.truck_x, self.truck_y + self.bounce_offset)
-            )
-
-        # Draw status text
-        status_text = (f"Fuel: {game_data['fuel']} | "
-                       f"Battery: {game_data['battery']} | "
-                       f"Morale: {game_data['morale']}")
-
         draw_text(
             surface,
             "Traveling to next mission site...",
             self.font_manager.get_font('regular'),
             (255, 255, 255),
             self.width // 2,
-            120
+            self.px(120)
         )
 
         draw_text(
@@ -140,81 +259,179 @@ class TravelScreen(ScreenBase):
             self.font_manager.get_font('small'),
             (255, 255, 255),
             self.width // 2,
-            200
+            self.px(200)
         )
 
+    def draw_dynamic(self, surface, game_data):
+        """Draw the truck and points; return their rects"""
+        rects = []
+        # Draw truck with bounce effect, part way through the current step
+        if self.truck:
+            truck_x = self.prev_truck_x + (
+                self.truck_x - self.prev_truck_x) * self.alpha
+            rects.append(surface.blit(
+                self.truck,
+                (truck_x, self.truck_y + self.bounce_offset)
+            ))
+
         # Draw points only in bottom right corner
         points_text = f"Points: {game_data['points']}"
-        draw_text(
+        rects.append(draw_text(
             surface,
             points_text,
             self.font_manager.get_font('large'),
             (255, 255, 0),  # Yellow color
-            self.width - 100,
-            self.height - 50
-        )
+            self.width - self.px(100),
+            self.height - self.px(50)
+        ))
+        return rects
 
 
 class MinigameScreen(ScreenBase):
+    # Bits of the per-step input bitmask for the held movement keys
+    INPUT_LEFT = minigame_sim.INPUT_LEFT
+    INPUT_RIGHT = minigame_sim.INPUT_RIGHT
+    INPUT_UP = minigame_sim.INPUT_UP
+    INPUT_DOWN = minigame_sim.INPUT_DOWN
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.ied_game = None
+        # Built on the first round, then shared by every later round so
+        # starting one does no asset loading
+        self.renderer = None
+        # Obstacle pool, likewise reused by every round
+        self.obstacles = None
+
+    @classmethod
+    def queue_preload(cls, preloader, width, height, scale=1.0):
+        """Queue this screen's assets on a preload.Preloader"""
+        preloader.add_sprites(MinigameRenderer.sprite_specs(
+            round(width * scale), round(height * scale), scale))
+        preloader.add_music('minigame')
 
     def init_game(
-        self, battery, lives, operator_mode=False, points=0
+        self, battery, lives, operator_mode=False, points=0,
+        difficulty='normal', rng=None
     ):
         """Initialize the IED minigame with the current lives count.
 
-        Operator mode can also be enabled.
+        Operator mode, a difficulty preset and the random.Random the round
+        draws from can also be chosen.
         """
+        if self.renderer is None:
+            self.renderer = MinigameRenderer(
+                self.width, self.height, self.asset_loader,
+                self.font_manager, self.scale)
+        # The round plays out at the layout size, whatever the render
+        # resolution
         self.ied_game = IEDMiniGame(
-            self.width,
-            self.height,
+            *self.layout_size,
             battery,
             lives,
             operator_mode,
             points,
+            renderer=self.renderer,
+            rng=rng,
+            difficulty=difficulty,
+            obstacles=self.obstacles,
         )
-        print(
-            f"Minigame initialized with battery: {battery}, "
-            f"lives: {lives}, operator mode: {operator_mode}"
+        self.obstacles = self.ied_game.obstacles
+        log.info(
+            "Minigame initialized with battery: %s, lives: %d, "
+            "operator mode: %s", battery, lives, operator_mode
         )
 
-    def update(self):
-        """Update minigame state"""
+    def update(self, input_mask=None):
+        """Advance the minigame one sim step.
+
+        The player moves by `input_mask` (INPUT_* bits), or by the keys
+        held right now if it is None.
+        """
         if self.ied_game:
+            if input_mask is None:
+                input_mask = self.read_input()
+            self.ied_game.begin_step()
+            self.apply_input(input_mask)
             self.ied_game.update()
 
     def draw(self, surface, game_data):
         """Draw minigame state"""
         if self.ied_game:
+            self.renderer.alpha = self.alpha
             self.ied_game.draw(surface)
             # Points should not be displayed in minigame
 
-    def handle_input(self, events):
-        """Handle minigame input"""
+    def draw_dirty(self, surface, game_data, full=False):
+        """Redraw only the moving sprites and HUD while a round is on"""
         if not self.ied_game:
-            return
-
+            return []
+        if self.ied_game.game_over:
+            # End-of-round screens are brief; draw them in full and start
+            # the next round with a full redraw
+            self.dirty.reset()
+            return super().draw_dirty(surface, game_data, full)
+        self.renderer.alpha = self.alpha
+        return self.renderer.draw_dirty(
+            surface, self.ied_game, self.dirty, full)
+
+    def read_input(self):
+        """Return the held movement keys as an INPUT_* bitmask"""
         keys = pygame.key.get_pressed()
         # Support both WASD and arrow keys
-        dx = (keys[pygame.K_d] or keys[pygame.K_RIGHT]) - \
-            (keys[pygame.K_a] or keys[pygame.K_LEFT])
-        dy = (keys[pygame.K_s] or keys[pygame.K_DOWN]) - \
-            (keys[pygame.K_w] or keys[pygame.K_UP])
+        input_mask = 0
+        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+            input_mask |= self.INPUT_LEFT
+        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+            input_mask |= self.INPUT_RIGHT
+        if keys[pygame.K_w] or keys[pygame.K_UP]:
+            input_mask |= self.INPUT_UP
+        if keys[pygame.K_s] or keys[pygame.K_DOWN]:
+            input_mask |= self.INPUT_DOWN
+        return input_mask
+
+    def apply_input(self, input_mask):
+        """Move the player by an INPUT_* bitmask"""
+        dx = bool(input_mask & self.INPUT_RIGHT) - \
+            bool(input_mask & self.INPUT_LEFT)
+        dy = bool(input_mask & self.INPUT_DOWN) - \
+            bool(input_mask & self.INPUT_UP)
 
         if dx != 0 or dy != 0:
             self.ied_game.move_player(dx, dy)
 
 
 class OutcomeScreen(ScreenBase):
+    BACKGROUND = "game_over.png"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.background = self.asset_loader.load_image(
-            "game_over.png",
+            self.BACKGROUND,
             (self.width, self.height)
         )
 
+    @classmethod
+    def queue_preload(cls, preloader, width, height, scale=1.0):
+        """Queue this screen's assets on a preload.Preloader"""
+        preloader.add_image(
+            cls.BACKGROUND, (round(width * scale), round(height * scale)))
+        preloader.add_music('gameover')
+
+    def draw_dirty(self, surface, game_data, full=False):
+        """Draw once, then report nothing changed until the score does"""
+        if self.dirty.needs_static(game_data['points']):
+            self.dirty.build_static(
+                surface,
+                lambda layer: self.draw(layer, game_data),
+                game_data['points']
+            )
+            full = True
+        if not full:
+            return []
+        self.dirty.begin(surface, full)
+        return self.dirty.end()
+
     def draw(self, surface, game_data):
         """Draw the game over screen with styled text"""
         if self.background:
@@ -252,3 +469,60 @@ class OutcomeScreen(ScreenBase):
             self.width // 2,
             (self.height // 3) * 2
         )
+
+
+class InterstitialScreen(ScreenBase):
+    """Full-screen message shown for a fixed time between states.
+
+    The content is drawn by a callback each frame, so the main loop keeps
+    running (and pumping events) while it is up. Optional fades blend the
+    content in from and out to black.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.draw_content = None
+        self.start_time = 0
+        self.duration = 0
+        self.fade_in = 0
+        self.fade_out = 0
+        self.now = 0  # Latest time from update, on start()'s clock
+        self.fade_overlay = pygame.Surface((self.width, self.height))
+        self.fade_overlay.fill((0, 0, 0))
+
+    def start(self, draw_content, now, duration=2000, fade_in=0,
+              fade_out=0):
+        """Show `draw_content(surface)` for `duration` ms from `now`"""
+        self.draw_content = draw_content
+        self.start_time = now
+        self.now = now
+        self.duration = duration
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+
+    def elapsed(self, now):
+        return now - self.start_time
+
+    def finished(self, now):
+        return self.elapsed(now) >= self.duration
+
+    def fade_alpha(self, now):
+        """Return the black overlay alpha (0-255) at time `now`"""
+        elapsed = self.elapsed(now)
+        remaining = self.duration - elapsed
+        level = 1.0
+        if self.fade_in and elapsed < self.fade_in:
+            level = elapsed / self.fade_in
+        if self.fade_out and remaining < self.fade_out:
+            level = min(level, remaining / self.fade_out)
+        return int(255 * (1 - max(0.0, min(1.0, level))))
+
+    def draw(self, surface, game_data):
+        """Draw the message with any fade applied"""
+        if self.draw_content:
+            self.draw_content(surface)
+
+        alpha = self.fade_alpha(self.now)
+        if alpha:
+            self.fade_overlay.set_alpha(alpha)
+            surface.blit(self.fade_overlay, (0, 0))
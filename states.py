@@ -6,10 +6,20 @@ class GameState(Enum):
     TRAVEL = 'travel'
     MINIGAME = 'minigame'
     OUTCOME = 'outcome'
+    # Timed full-screen message between two other states
+    INTERSTITIAL = 'interstitial'
 
 
 class StateManager:
-    def __init__(self):
+    """Current game state, shared game data and state transitions.
+
+    Screens are created by `screen_factory(state)` the first time they
+    are needed. Callbacks registered with on_enter()/on_exit() run on
+    every change_state(): exit hooks get the state being entered, enter
+    hooks get the state being left.
+    """
+
+    def __init__(self, screen_factory=None):
         self.current_state = GameState.MENU
         self.previous_state = None
         self.game_data = {
@@ -23,11 +33,42 @@ class StateManager:
             'game_start': None,
             'travel': None
         }
+        self.screen_factory = screen_factory
+        self.screens = {}
+        self.enter_hooks = {}
+        self.exit_hooks = {}
+
+    def screen(self, state=None):
+        """Return a state's screen, creating it on first use"""
+        if state is None:
+            state = self.current_state
+        screen = self.screens.get(state)
+        if screen is None and self.screen_factory is not None:
+            screen = self.screens[state] = self.screen_factory(state)
+        return screen
+
+    def on_enter(self, state, callback):
+        """Call callback(previous_state) whenever `state` is entered"""
+        self.enter_hooks.setdefault(state, []).append(callback)
+
+    def on_exit(self, state, callback):
+        """Call callback(next_state) whenever `state` is left"""
+        self.exit_hooks.setdefault(state, []).append(callback)
+
+    def start(self, state=GameState.MENU):
+        """Enter the first state, running its enter hooks"""
+        self.current_state = state
+        for callback in self.enter_hooks.get(state, ()):
+            callback(None)
 
     def change_state(self, new_state):
         """Change game state and store previous state"""
+        for callback in self.exit_hooks.get(self.current_state, ()):
+            callback(new_state)
         self.previous_state = self.current_state
         self.current_state = new_state
+        for callback in self.enter_hooks.get(new_state, ()):
+            callback(self.previous_state)
 
     def update_timer(self, timer_key, time_value):
         """Update specific timer"""
@@ -0,0 +1,103 @@
+import os
+import pygame
+import pytest
+from asset_pack import AssetPack, write_pack
+from hit_masks import HitMasks
+from utils import blit_ready
+
+
+def test_pack_round_trips_pixels(tmp_path):
+    surface = pygame.Surface((3, 2), pygame.SRCALPHA)
+    surface.fill((10, 20, 30, 128))
+    surface.set_at((2, 1), (255, 0, 0, 255))
+    key = ("sprite.png", (3, 2), 1.3)
+
+    path = str(tmp_path / "test.pack")
+    write_pack(path, {key: surface})
+    pack = AssetPack(path)
+
+    assert key in pack
+    assert ("sprite.png", (3, 2), 1) not in pack
+    loaded = pack.load(key)
+    assert loaded.get_size() == (3, 2)
+    assert loaded.get_at((0, 0)) == (10, 20, 30, 128)
+    assert loaded.get_at((2, 1)) == (255, 0, 0, 255)
+
+
+def test_opaque_sprites_load_without_alpha(tmp_path):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((8, 8))
+    opaque = pygame.Surface((4, 4), pygame.SRCALPHA)
+    opaque.fill((10, 20, 30, 255))
+    sprite = opaque.copy()
+    sprite.set_at((0, 0), (0, 0, 0, 0))
+
+    try:
+        ready_opaque = blit_ready(opaque)
+        ready_sprite = blit_ready(sprite)
+        assert not ready_opaque.get_flags() & pygame.SRCALPHA
+        assert ready_sprite.get_flags() & pygame.SRCALPHA
+        assert ready_sprite.get_at((0, 0)).a == 0
+
+        # The pack keeps that split, storing opaque sprites as plain RGB
+        path = str(tmp_path / "test.pack")
+        index = write_pack(path, {("bg.png", None, 1): ready_opaque})
+        assert index["bg.png|original|1.0"]["format"] == "RGB"
+        loaded = AssetPack(path).load(("bg.png", None, 1))
+        assert loaded.get_at((3, 3)) == (10, 20, 30, 255)
+    finally:
+        pygame.quit()
+
+
+@pytest.mark.parametrize("scale", [1.0, 0.5])
+def test_bake_includes_minigame_sprites(tmp_path, scale):
+    from asset_pack import bake, pack_key
+    from game import MinigameRenderer
+
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = str(tmp_path / "assets.pack")
+    specs = list(MinigameRenderer.sprite_specs(
+        round(1024 * scale), round(768 * scale), scale).values())
+    hit_masks_path = str(tmp_path / "hit_masks.npz")
+    try:
+        bake(base_path, path=path, scale=scale,
+             hit_masks_path=hit_masks_path)
+        pack = AssetPack(path)
+        for spec in specs:
+            filename, color, size, scale_factor = spec
+            assert pack_key((filename, size, scale_factor)) in pack.index
+        # Hit masks are at layout size whatever the render scale
+        assert HitMasks.load(hit_masks_path).player.shape == (156, 156)
+    finally:
+        pygame.quit()
+
+
+def test_truncated_packs_are_ignored(tmp_path):
+    from utils import AssetLoader
+
+    surface = pygame.Surface((4, 4), pygame.SRCALPHA)
+    path = str(tmp_path / "test.pack")
+    write_pack(path, {("sprite.png", (4, 4), 1.3): surface})
+    with open(path, "rb") as pack_file:
+        data = pack_file.read()
+    for length in (7, len(data) - 1):
+        with open(path, "wb") as pack_file:
+            pack_file.write(data[:length])
+        with pytest.raises(ValueError):
+            AssetPack(path)
+
+    # A bad pack in assets/ is skipped and sprites load without it
+    os.makedirs(tmp_path / "assets")
+    os.replace(path, tmp_path / "assets" / "assets.pack")
+    asset_loader = AssetLoader(str(tmp_path))
+    assert asset_loader.pack is None
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((8, 8))
+    try:
+        sprite = asset_loader.load_sprite(
+            "sprite.png", (255, 0, 0), (4, 4))
+        assert sprite.get_at((0, 0)) == (255, 0, 0, 255)
+    finally:
+        pygame.quit()
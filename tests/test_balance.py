@@ -0,0 +1,17 @@
+from balance import sweep
+
+
+def test_sweep_is_reproducible_across_worker_counts():
+    grid = [{'BATTERY_DRAIN': 0.5, 'IED_MIN_DISTANCE': 300}]
+    one = sweep(grid, ['seek', 'wander'], rounds=30, seed=4, workers=1,
+                chunk_size=10)
+    two = sweep(grid, ['seek', 'wander'], rounds=30, seed=4, workers=2,
+                chunk_size=10)
+    assert one == two
+
+    tuning, policy, summary = one[0]
+    assert (tuning, policy) == (grid[0], 'seek')
+    assert summary['rounds'] == 30
+    assert 0 < summary['win_rate'] <= 1
+    # Battery drains 0.5 per step, so no round outlasts 200 steps
+    assert summary['round_length_s']['histogram']['edges'][-1] <= 200 / 60
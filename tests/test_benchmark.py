@@ -0,0 +1,16 @@
+from benchmark import find_regressions
+
+
+def test_regressions_flag_slowdowns_and_allocation_growth():
+    baseline = {
+        'menu.draw': {'fps': 1000, 'alloc_bytes': 10_000},
+        'sim.update[0]': {'fps': 5000, 'alloc_bytes': 100},
+    }
+    results = {
+        'menu.draw': {'fps': 800, 'alloc_bytes': 20_000},
+        'sim.update[0]': {'fps': 4900, 'alloc_bytes': 600},  # Within slack
+        'travel.draw': {'fps': 1, 'alloc_bytes': 0},  # No baseline
+    }
+    regressions = find_regressions(results, baseline, threshold=0.15)
+    assert len(regressions) == 2
+    assert all(message.startswith("menu.draw") for message in regressions)
@@ -0,0 +1,57 @@
+import os
+import random
+import pygame
+from dirty_rects import DirtyRectTracker
+
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAME_DATA = {'points': 42, 'lives': 3, 'battery': 100, 'fuel': 100,
+             'morale': 100}
+
+
+def test_end_falls_back_to_one_full_update():
+    tracker = DirtyRectTracker(100, 100)
+    tracker.add(pygame.Rect(0, 0, 10, 10))
+    assert tracker.end() == [pygame.Rect(0, 0, 10, 10)]
+    # Last frame's rect is returned again so it gets erased on screen
+    tracker.add(pygame.Rect(20, 0, 10, 10))
+    assert tracker.end() == [pygame.Rect(0, 0, 10, 10),
+                             pygame.Rect(20, 0, 10, 10)]
+
+    tracker.extend(pygame.Rect(i, 0, 1, 1)
+                   for i in range(DirtyRectTracker.MAX_RECTS + 1))
+    assert tracker.end() == [pygame.Rect(0, 0, 100, 100)]
+
+
+def test_dirty_draws_match_full_draws():
+    from utils import AssetLoader, FontManager
+    from screens import TravelScreen, MinigameScreen
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1024, 768))
+    try:
+        asset_loader = AssetLoader(BASE_PATH)
+        font_manager = FontManager(BASE_PATH)
+        for screen_class in (TravelScreen, MinigameScreen):
+            full, dirty = (
+                screen_class(1024, 768, asset_loader, font_manager, None)
+                for _ in range(2))
+            if screen_class is MinigameScreen:
+                for screen in (full, dirty):
+                    screen.init_game(100, 3, rng=random.Random(1))
+            full_surface, dirty_surface = (
+                pygame.Surface((1024, 768)).convert() for _ in range(2))
+            for _ in range(120):
+                if screen_class is MinigameScreen:
+                    full.update(MinigameScreen.INPUT_RIGHT)
+                    dirty.update(MinigameScreen.INPUT_RIGHT)
+                else:
+                    full.update()
+                    dirty.update()
+                full.draw(full_surface, GAME_DATA)
+                dirty.draw_dirty(dirty_surface, GAME_DATA)
+                assert (pygame.image.tobytes(full_surface, "RGB")
+                        == pygame.image.tobytes(dirty_surface, "RGB"))
+    finally:
+        pygame.quit()
@@ -0,0 +1,34 @@
+import os
+import shutil
+import pygame
+from utils import FontManager
+
+
+def test_fonts_resolve_once_and_bundled_font_skips_lookup(
+        tmp_path, monkeypatch):
+    pygame.font.init()
+    lookups = []
+    real_match_font = pygame.font.match_font
+
+    def counting_match_font(name, bold=False, italic=False):
+        lookups.append((name, bold))
+        return real_match_font(name, bold, italic)
+    monkeypatch.setattr(pygame.font, "match_font", counting_match_font)
+
+    (tmp_path / "assets").mkdir()
+    manager = FontManager(str(tmp_path))
+    assert manager.font(24) is manager.font(24)
+    assert manager.get_font('large') is manager.font(40, bold=True)
+    first_lookups = len(lookups)
+    assert first_lookups <= 2  # One per weight
+
+    # A second run reads the resolved paths from the on-disk cache
+    FontManager(str(tmp_path)).font(24)
+    assert len(lookups) == first_lookups
+
+    default_font = os.path.join(
+        os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+    shutil.copy(default_font, tmp_path / "assets" / FontManager.BUNDLED_FONT)
+    os.remove(tmp_path / "assets" / FontManager.CACHE_FILENAME)
+    FontManager(str(tmp_path)).font(30, bold=True)
+    assert len(lookups) == first_lookups
@@ -0,0 +1,24 @@
+import io
+import logging
+import gamelog
+
+
+def test_records_are_buffered_until_flushed_and_categories_switch():
+    stream = io.StringIO()
+    handler = gamelog.configure(stream=stream, flush_interval=60)
+    try:
+        gamelog.enable_category("test.quiet", False)
+        gamelog.set_category_level("test.verbose", logging.DEBUG)
+
+        gamelog.get_logger("test").info("kept %d", 1)
+        gamelog.get_logger("test").debug("below root level")
+        gamelog.get_logger("test.quiet").error("switched off")
+        gamelog.get_logger("test.verbose").debug("traced")
+        assert stream.getvalue() == ""
+
+        handler.flush()
+        assert stream.getvalue() == "kept 1\ntraced\n"
+    finally:
+        gamelog.shutdown()
+        gamelog.enable_category("test.quiet")
+        gamelog.enable_category("test.verbose")
@@ -0,0 +1,68 @@
+import os
+import random
+import numpy as np
+import pygame
+import minigame_sim
+from hit_masks import HitMasks, hit_table
+from minigame_sim import MinigameSim
+
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_masks_decide_hits_only_where_boxes_overlap():
+    # A 156px player whose pixels are only the middle 56px square
+    player = np.zeros((156, 156), dtype=np.bool_)
+    player[50:106, 50:106] = True
+    block = np.ones((65, 65), dtype=np.bool_)
+    masks = HitMasks(player, np.ones((52, 52), dtype=np.bool_),
+                     [block, block])
+    assert masks.player_bounds == (50, 50, 56, 56)
+    sim = MinigameSim(1024, 768, rng=random.Random(1), hit_masks=masks)
+    sim.player_pos = [400, 300]
+    sim.ied_pos = [900, 700]
+
+    # Inside the player's sprite but clear of its pixels
+    sim.obstacles.spawn(340, 240)
+    assert not sim.check_collision_with_obstacles()
+    sim.ied_pos = [510, 410]
+    assert not sim.check_ied_collision()
+
+    sim.obstacles.spawn(460, 360)
+    assert sim.check_collision_with_obstacles()
+    sim.ied_pos = [460, 360]
+    assert sim.check_ied_collision()
+
+
+def test_hit_table_matches_comparing_pixels():
+    rng = np.random.default_rng(3)
+    mask = rng.random((7, 5)) < 0.3
+    other = rng.random((4, 6)) < 0.5
+    table = hit_table(mask, other)
+    assert table.shape == (10, 10)
+    for dy in range(-3, 7):
+        for dx in range(-5, 5):
+            placed = np.zeros((7 + 8, 5 + 12), dtype=np.bool_)
+            placed[4 + dy:8 + dy, 6 + dx:12 + dx] = other
+            touching = (placed[4:11, 6:11] & mask).any()
+            assert table[dy + 3, dx + 5] == touching
+
+
+def test_baked_masks_match_the_sprites():
+    from asset_pack import sprite_hit_masks
+    from utils import AssetLoader
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((8, 8))
+    try:
+        sprites = sprite_hit_masks(AssetLoader(BASE_PATH, use_pack=False))
+    finally:
+        pygame.quit()
+    # Re-run `python asset_pack.py` if this fails after changing a sprite
+    baked = minigame_sim.default_hit_masks()
+    assert np.array_equal(baked.player, sprites.player)
+    assert np.array_equal(baked.ied, sprites.ied)
+    assert len(baked.obstacles) == len(sprites.obstacles)
+    for baked_mask, sprite_mask in zip(baked.obstacles, sprites.obstacles):
+        assert np.array_equal(baked_mask, sprite_mask)
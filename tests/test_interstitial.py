@@ -0,0 +1,14 @@
+from screens import InterstitialScreen
+
+
+def test_interstitial_times_out_and_fades():
+    screen = InterstitialScreen(800, 600, None, None, None)
+    screen.start(lambda surface: None, now=1000, duration=2000,
+                 fade_in=200, fade_out=500)
+
+    assert screen.fade_alpha(1000) == 255  # Fully black at the start
+    assert screen.fade_alpha(1100) == 127
+    assert screen.fade_alpha(2000) == 0
+    assert screen.fade_alpha(2750) == 127
+    assert not screen.finished(2999)
+    assert screen.finished(3000)
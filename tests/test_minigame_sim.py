@@ -0,0 +1,40 @@
+import random
+import minigame_sim
+from minigame_sim import MinigameSim
+
+
+def test_sim_builds_without_pygame():
+    assert "pygame" not in vars(minigame_sim)
+    sim = MinigameSim(800, 600, rng=random.Random(1))
+    assert not sim.game_over
+    assert sim.ied_pos is not None
+
+
+def test_same_seed_gives_same_round():
+    a = MinigameSim(800, 600, rng=random.Random(7))
+    b = MinigameSim(800, 600, rng=random.Random(7))
+    for _ in range(500):
+        a.update()
+        b.update()
+    assert a.ied_pos == b.ied_pos
+    assert a.battery == b.battery
+    assert list(a.obstacles.items()) == list(b.obstacles.items())
+
+
+def test_finding_ied_ends_round_with_success():
+    sim = MinigameSim(800, 600, rng=random.Random(3))
+    sim.ied_pos = [sim.player_pos[0] + 40, sim.player_pos[1] + 40]
+    sim.update()
+    assert sim.game_over
+    assert sim.success
+
+
+def test_detector_beeps_faster_near_ied():
+    sim = MinigameSim(800, 600, rng=random.Random(5))
+    centre = sim.IED_SIZE // 2
+    near = sim.proximity_at(sim.ied_pos[0] + centre,
+                            sim.ied_pos[1] + centre)
+    assert near == sim.proximity.max()
+    assert sim.proximity_at(-1000, -1000) < near
+    assert minigame_sim.BEEP_INTERVALS[near] < \
+        minigame_sim.BEEP_INTERVALS[0]
@@ -0,0 +1,41 @@
+import os
+import time
+import pygame
+from utils import MusicManager
+
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def play_when_decoded(music, track_key):
+    assert music.play(track_key)
+    deadline = time.monotonic() + 10
+    while music.current_track != track_key:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+        music.update()
+
+
+def test_tracks_crossfade_and_stay_within_budget():
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.mixer.init()
+    try:
+        music = MusicManager(BASE_PATH)
+        play_when_decoded(music, 'menu')
+        # Room for two decoded tracks, not three (they are all 30s long)
+        music.budget_bytes = int(music.used_bytes * 2.5)
+        first_channel = music.channels[music.active]
+        assert first_channel.get_busy()
+
+        play_when_decoded(music, 'travel')
+        assert music.channels[music.active] is not first_channel
+
+        play_when_decoded(music, 'gameover')
+        assert list(music.sounds) == ['travel', 'gameover']
+        assert music.used_bytes <= music.budget_bytes
+
+        # Replaying a cached track starts without waiting on a decode
+        music.play('travel')
+        assert music.current_track == 'travel'
+    finally:
+        pygame.mixer.quit()
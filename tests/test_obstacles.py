@@ -0,0 +1,59 @@
+import numpy as np
+from obstacles import BROADPHASE_MIN_COUNT, ObstacleField, DOGE
+
+
+def test_advance_moves_and_culls_in_spawn_order():
+    field = ObstacleField(50, capacity=2)
+    field.spawn(10, 0)
+    field.spawn(20, 95, DOGE)
+    field.spawn(30, 50)
+    assert field.capacity >= 3
+
+    removed = field.advance(10, 100)
+
+    assert removed == 1
+    assert list(field.items()) == [(10.0, 10.0, 0), (30.0, 60.0, 0)]
+
+
+def test_first_hit_uses_rect_overlap_rules():
+    field = ObstacleField(50)
+    field.spawn(200, 200)
+    field.spawn(100, 100)
+
+    assert field.first_hit(0, 0, 100, 100) == -1  # Touching edges only
+    assert field.first_hit(0, 0, 101, 101) == 1
+    assert field.first_hit(180, 180, 40, 40) == 0
+
+
+def test_broadphase_matches_brute_force():
+    rng = np.random.default_rng(5)
+    banded = ObstacleField(50)
+    brute = ObstacleField(50, broadphase=False)
+    for _ in range(600):
+        for field in (banded, brute):
+            field.advance(1.58203125, 768)
+        for x in rng.integers(0, 974, 8):
+            banded.spawn(x, -50)
+            brute.spawn(x, -50)
+    assert len(banded) >= BROADPHASE_MIN_COUNT
+
+    for px, py in rng.integers(0, 900, (200, 2)):
+        assert (banded.first_hit(px, py, 120, 120)
+                == brute.first_hit(px, py, 120, 120))
+
+
+def test_sorted_field_culls_a_prefix_and_reuses_slots():
+    field = ObstacleField(50, capacity=4)
+    for y in (300, 200, 100, 0):  # Lowest first, as the game spawns
+        field.spawn(y, y)
+    assert field.keys_sorted
+
+    assert field.advance(150, 300) == 2
+    assert list(field.items()) == [(100.0, 250.0, 0), (0.0, 150.0, 0)]
+
+    field.spawn(5, -50)
+    field.spawn(6, -50)
+    field.clear()
+    field.spawn(7, -50)
+    assert (field.capacity, field.grows) == (4, 0)
+    assert (field.spawned, field.peak) == (7, 4)
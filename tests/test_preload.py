@@ -0,0 +1,46 @@
+import os
+import time
+import pygame
+from preload import Preloader
+from utils import AssetLoader, MusicManager
+
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_preloader_loads_queued_assets_in_the_background():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((8, 8))
+    try:
+        asset_loader = AssetLoader(BASE_PATH, use_pack=False)
+        music = MusicManager(BASE_PATH)
+        preloader = Preloader(asset_loader, music)
+        assert preloader.ready
+
+        preloader.add_image("hair_gel.png", (60, 60), 1.3, (255, 255, 0))
+        preloader.add_image("missing.png", (10, 10), 1.3, (255, 0, 0))
+        preloader.add_music('menu')
+        # Queueing something already queued is a no-op
+        preloader.add_image("hair_gel.png", (60, 60), 1.3, (255, 255, 0))
+        assert preloader.total == 3
+        assert preloader.progress == 0.0
+
+        deadline = time.monotonic() + 10
+        while not preloader.ready:
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+            preloader.pump()
+        assert preloader.progress == 1.0
+
+        assert asset_loader.cached_images[
+            ("hair_gel.png", (60, 60), 1.3)].get_size() == (78, 78)
+        # Missing files fall back to load_sprite's plain colored sprite
+        fallback = asset_loader.cached_images[
+            ("missing.png", (10, 10), 1.3)]
+        assert fallback.get_size() == (13, 13)
+        assert fallback.get_at((0, 0)) == (255, 0, 0, 255)
+        assert 'menu' in music.sounds
+    finally:
+        pygame.quit()
@@ -0,0 +1,49 @@
+import gc
+import json
+from profiler import PhaseStats, FrameProfiler, GCMonitor
+
+
+def test_phase_stats_percentiles_and_worst():
+    stats = PhaseStats(window=100)
+    for ms in range(1, 101):
+        stats.add(ms * 1_000_000)
+
+    summary = stats.summary()
+    assert summary['p50'] == 51
+    assert summary['p99'] == 100
+    assert summary['worst'] == 100
+    assert summary['count'] == 100
+    assert sum(stats.histogram) == 100
+
+
+def test_profiler_exports_every_phase(tmp_path):
+    profiler = FrameProfiler()
+    profiler.begin_frame()
+    with profiler.phase("update"):
+        pass
+    profiler.end_frame()
+
+    path = tmp_path / "profile.json"
+    profiler.export_json(str(path))
+    report = json.loads(path.read_text())
+    assert set(report['phases']) == {"update", "frame"}
+    assert report['phases']['frame']['count'] == 1
+
+
+def test_gc_monitor_times_collections_and_freezes():
+    profiler = FrameProfiler()
+    monitor = GCMonitor(profiler)
+    try:
+        gc.collect()
+        assert monitor.collections[2] >= 1
+        assert profiler.summary()['gc.gen2']['count'] >= 1
+
+        monitor.freeze()
+        assert gc.get_freeze_count() > 0
+        monitor.thaw()
+        assert gc.get_freeze_count() == 0
+    finally:
+        monitor.close()
+    collections = list(monitor.collections)
+    gc.collect()
+    assert monitor.collections == collections
@@ -0,0 +1,51 @@
+import os
+import pygame
+from utils import present_scaled
+
+
+def test_present_scaled_upscales_only_dirty_rects():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    try:
+        display = pygame.display.set_mode((8, 8))
+        display.fill((0, 0, 0))
+        frame = pygame.Surface((4, 4))
+        frame.fill((255, 0, 0))
+        frame.fill((0, 255, 0), (1, 1, 2, 2))
+
+        rects = present_scaled(frame, display, [pygame.Rect(1, 1, 2, 2)])
+
+        assert rects == [pygame.Rect(2, 2, 4, 4)]
+        assert display.get_at((2, 2)) == (0, 255, 0)
+        assert display.get_at((5, 5)) == (0, 255, 0)
+        assert display.get_at((1, 1)) == (0, 0, 0)  # Not redrawn
+
+        assert present_scaled(frame, display) == [display.get_rect()]
+        assert display.get_at((1, 1)) == (255, 0, 0)
+    finally:
+        pygame.quit()
+
+
+def test_present_scaled_rects_match_the_whole_frame_at_any_scale():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    try:
+        display = pygame.display.set_mode((8, 8))
+        frame = pygame.Surface((6, 6))  # Scale 0.75
+        for x in range(6):
+            for y in range(6):
+                frame.set_at((x, y), (x * 40, y * 40, 0))
+        whole = pygame.Surface((8, 8))
+        present_scaled(frame, whole)
+
+        display.fill((0, 0, 255))
+        rects = present_scaled(frame, display, [pygame.Rect(4, 1, 1, 1)])
+
+        # Widened to the 3x3 frame block that maps onto 4x4 pixels
+        assert rects == [pygame.Rect(4, 0, 4, 4)]
+        for x in range(4, 8):
+            for y in range(4):
+                assert display.get_at((x, y)) == whole.get_at((x, y))
+        assert display.get_at((3, 0)) == (0, 0, 255)
+    finally:
+        pygame.quit()
@@ -0,0 +1,60 @@
+import itertools
+import os
+import pygame
+from game_manager import GameManager
+from replay import Recording, replay, COMMAND_START
+from states import GameState
+from utils import AssetLoader, MusicManager, FontManager
+
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_recording_round_trips_through_bytes():
+    recording = Recording(seed=123, difficulty='stress')
+    recording.steps = 900
+    recording.add_command(10, COMMAND_START)
+    for input_mask in [0] * 70000 + [5, 5, 2]:
+        recording.add_input(input_mask)
+
+    loaded = Recording.from_bytes(recording.to_bytes())
+    assert (loaded.seed, loaded.difficulty, loaded.steps) == \
+        (123, 'stress', 900)
+    assert loaded.commands == [(10, COMMAND_START)]
+    assert list(loaded.inputs()) == list(recording.inputs())
+    assert len(recording.to_bytes()) < 100
+
+
+def test_replay_reproduces_a_recorded_session(tmp_path):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    managers = (AssetLoader(BASE_PATH), MusicManager(BASE_PATH),
+                FontManager())
+    recorded = None
+    try:
+        recorded = GameManager(
+            800, 600, *managers, seed=99,
+            record_path=str(tmp_path / "session.rec"))
+        # Hold changing movement keys through uneven frame times
+        held = itertools.cycle([0] * 20 + [2] * 30 + [9] * 25 + [4] * 10)
+        minigame = recorded.states.screen(GameState.MINIGAME)
+        minigame.read_input = lambda: next(held)
+        frame_times = itertools.cycle([7, 33, 16, 50, 16, 120])
+
+        recorded.update(16)
+        recorded.start_mission()
+        while recorded.timestep.steps < 1500:
+            recorded.update(next(frame_times))
+        recorded.recording.steps = recorded.timestep.steps
+
+        replayed = replay(recorded.recording, *managers,
+                          width=800, height=600)
+        assert replayed.timestep.steps == recorded.timestep.steps
+        assert replayed.current_state == recorded.current_state
+        assert replayed.game_data == recorded.game_data
+        assert replayed.rng.getstate() == recorded.rng.getstate()
+    finally:
+        if recorded is not None:
+            recorded.gc_monitor.close()
+        pygame.quit()
@@ -14,3 +14,20 @@ def test_change_state_updates_current_and_previous():
     sm.change_state(GameState.MINIGAME)
     assert sm.previous_state == GameState.TRAVEL
     assert sm.current_state == GameState.MINIGAME
+
+
+def test_hooks_run_on_transitions_and_screens_build_lazily():
+    built = []
+    calls = []
+    sm = StateManager(lambda state: built.append(state) or state.value)
+    sm.on_enter(GameState.TRAVEL, lambda prev: calls.append(('in', prev)))
+    sm.on_exit(GameState.TRAVEL, lambda nxt: calls.append(('out', nxt)))
+
+    sm.change_state(GameState.TRAVEL)
+    sm.change_state(GameState.MINIGAME)
+    assert calls == [('in', GameState.MENU), ('out', GameState.MINIGAME)]
+
+    assert built == []
+    assert sm.screen() == 'minigame'
+    assert sm.screen(GameState.MINIGAME) == 'minigame'
+    assert built == [GameState.MINIGAME]
@@ -0,0 +1,16 @@
+import pygame
+from utils import TextCache
+
+
+def test_text_cache_hits_and_evicts_least_recently_used():
+    pygame.font.init()
+    font = pygame.font.Font(None, 20)
+    cache = TextCache(max_size=2)
+
+    first = cache.render(font, "one", (255, 255, 255))
+    assert cache.render(font, "one", (255, 255, 255)) is first
+    cache.render(font, "one", (255, 0, 0))  # Different color, new entry
+    cache.render(font, "two", (255, 255, 255))  # Evicts white "one"
+
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert cache.render(font, "one", (255, 255, 255)) is not first
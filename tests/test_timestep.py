@@ -0,0 +1,32 @@
+import random
+from minigame_sim import MinigameSim
+from timestep import FixedTimestep
+
+
+def test_accumulator_carries_remainder_and_caps_catch_up():
+    timestep = FixedTimestep(step_hz=100, max_steps=3)
+    assert timestep.advance(25) == 2
+    assert timestep.alpha == 0.5
+    assert timestep.advance(5) == 1
+    assert timestep.advance(100) == 3  # 10 steps due, 7 dropped
+    assert timestep.dropped == 7
+    for _ in range(6):
+        timestep.step()
+    assert timestep.time_ms == 60
+
+
+def test_sim_matches_at_any_frame_rate():
+    results = []
+    for fps in (30, 60, 144):
+        sim = MinigameSim(800, 600, rng=random.Random(5))
+        timestep = FixedTimestep(MinigameSim.STEP_HZ)
+        for frame in range(2 * fps):  # Two seconds of whole-ms frames
+            dt_ms = (frame + 1) * 1000 // fps - frame * 1000 // fps
+            for _ in range(timestep.advance(dt_ms)):
+                timestep.step()
+                sim.begin_step()
+                sim.move_player(1, 0)
+                sim.update()
+        results.append((timestep.steps, sim.player_pos, sim.battery,
+                        list(sim.obstacles.items())))
+    assert results[0] == results[1] == results[2]
@@ -0,0 +1,60 @@
+import random
+import numpy as np
+from minigame_sim import MinigameSim, INPUT_RIGHT, INPUT_DOWN
+from vector_env import VectorMinigameEnv
+
+
+def test_vector_games_follow_the_scalar_rules():
+    no_spawns = {'spawn_chance': 10**9}
+    env = VectorMinigameEnv(4, 800, 600, seed=2, tuning=no_spawns)
+    env.ied[:] = [[700, 500], [500, 250], [60, 500], [380, 280]]
+    # Walk right then down: games 0 and 1 find their IEDs, game 2 runs
+    # its battery flat and game 3's IED is right under the player
+    expected = []
+    for ied in env.ied.tolist():
+        sim = MinigameSim(800, 600, rng=random.Random(0), tuning=no_spawns)
+        sim.ied_pos = ied
+        steps = 0
+        while not sim.game_over:
+            steps += 1
+            sim.move_player(*((1, 0) if steps <= 25 else (0, 1)))
+            sim.update()
+        expected.append((sim.success, steps))
+
+    finished = {}
+    for step in range(1, 1000):
+        action = INPUT_RIGHT if step <= 25 else INPUT_DOWN
+        _, rewards, dones, info = env.step(np.full(4, action))
+        for game in np.flatnonzero(dones):
+            finished.setdefault(
+                int(game), (bool(info['success'][game]), step))
+    assert [finished[game] for game in range(4)] == expected
+    assert [success for success, _ in expected] == [
+        True, True, False, True]
+
+
+def test_stress_spawning_grows_obstacle_slots():
+    env = VectorMinigameEnv(8, seed=1, difficulty='stress', capacity=4)
+    for _ in range(100):
+        _, rewards, dones, _ = env.step(np.zeros(8, dtype=np.int64))
+    assert env.alive.shape[1] > 4
+    assert env.alive.sum(axis=1).max() <= env.alive.shape[1]
+
+
+def test_vector_obstacle_hits_match_the_scalar_masks():
+    env = VectorMinigameEnv(64, seed=5, tuning={'spawn_chance': 10**9})
+    rng = np.random.default_rng(5)
+    env.player[:] = [400, 300]
+    env.obstacle_x[:, 0] = 400 + rng.uniform(-70, 160, size=64)
+    env.obstacle_y[:, 0] = 300 + rng.uniform(-70, 160, size=64)
+    env.obstacle_kind[:, 0] = rng.integers(0, 2, size=64)
+    env.alive[:, 0] = True
+
+    masks = env.hit_masks
+    expected = [
+        masks.player_hits_obstacle(400, 300, env.obstacle_x[game, 0],
+                                   env.obstacle_y[game, 0],
+                                   env.obstacle_kind[game, 0])
+        for game in range(64)]
+    assert env._obstacle_hit().tolist() == expected
+    assert 0 < sum(expected) < 64
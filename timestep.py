@@ -0,0 +1,46 @@
+class FixedTimestep:
+    """Turns variable frame times into whole fixed-length sim steps.
+
+    Each frame's elapsed time is added to an accumulator, and advance()
+    returns how many steps of `step_ms` fit in it; the caller calls step()
+    as it runs each one, so `time_ms` is exact at every step. The
+    remainder carries over to the next frame; `alpha` is how far the
+    display is between the last two steps, for interpolating what is
+    drawn. If the renderer falls far behind, at most `max_steps` steps run
+    in one frame and the rest of the backlog is dropped rather than
+    snowballing.
+    """
+
+    def __init__(self, step_hz=60, max_steps=5):
+        self.step_hz = step_hz
+        self.step_ms = 1000 / step_hz
+        self.max_steps = max_steps
+        # Unspent frame time in ms * step_hz, so whole-ms frame times add
+        # up exactly and one step is exactly 1000
+        self.accumulator = 0
+        self.steps = 0  # Steps run so far
+        self.dropped = 0  # Steps skipped to stay within max_steps
+
+    @property
+    def time_ms(self):
+        """Simulated time so far, in ms"""
+        return self.steps * 1000 / self.step_hz
+
+    @property
+    def alpha(self):
+        """Fraction of a step between the last step and now (0.0 to 1.0)"""
+        return self.accumulator / 1000
+
+    def advance(self, dt_ms):
+        """Add dt_ms of frame time and return the number of steps due"""
+        self.accumulator += dt_ms * self.step_hz
+        steps = int(self.accumulator // 1000)
+        self.accumulator -= steps * 1000
+        if steps > self.max_steps:
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+        return steps
+
+    def step(self):
+        """Count one step as run"""
+        self.steps += 1
@@ -1,36 +1,175 @@
+import json
+import math
 import os
+import queue
+import threading
+from collections import OrderedDict
 import pygame
+from asset_pack import AssetPack, default_pack_path
+from gamelog import get_logger
+
+
+asset_log = get_logger("assets")
+music_log = get_logger("music")
+font_log = get_logger("fonts")
+
+
+def has_transparency(image):
+    """Return whether any pixel of `image` is not fully opaque"""
+    if not image.get_flags() & pygame.SRCALPHA:
+        return image.get_colorkey() is not None
+    return int(pygame.surfarray.pixels_alpha(image).min()) < 255
+
+
+def blit_ready(image):
+    """Convert an image to the display format that blits fastest.
+
+    Opaque images become plain display surfaces, so blitting them is a
+    copy instead of a per-pixel alpha blend. Images with transparent
+    pixels keep their alpha and are RLE accelerated, which skips the
+    fully transparent runs and copies the opaque ones.
+    """
+    if not has_transparency(image):
+        return image.convert()
+    image = image.convert_alpha()
+    image.set_alpha(255, pygame.RLEACCEL)
+    return image
 
 
 class AssetLoader:
-    def __init__(self, base_path):
+    def __init__(self, base_path, use_pack=True):
         self.base_path = base_path
         self.cached_images = {}
+        self.cached_masks = {}  # Collision masks, by image cache key
         self.cached_sounds = {}
 
+        # Prebaked sprites (see asset_pack.py), if a pack has been built
+        self.pack = None
+        pack_path = default_pack_path(base_path)
+        if use_pack and os.path.exists(pack_path):
+            try:
+                self.pack = AssetPack(pack_path)
+            except (OSError, ValueError) as e:
+                asset_log.warning("Ignoring asset pack %s: %s", pack_path, e)
+
+    def load_baked(self, cache_key):
+        """Build and cache a sprite from the asset pack, if it was baked"""
+        if self.pack is None:
+            return None
+        try:
+            image = self.pack.load(cache_key)
+        except (ValueError, pygame.error) as e:
+            # Fall back to decoding the image file
+            asset_log.warning("Could not load %s from the asset pack: %s",
+                              cache_key[0], e)
+            return None
+        if image is None:
+            return None
+        return self.store(cache_key, image)
+
+    def decode(self, filename, size=None, scale_factor=1):
+        """Decode an image file and scale it to `size` times `scale_factor`.
+
+        Does not touch the display or the cache, so it is safe to call
+        from a worker thread. Finish the result with store().
+        """
+        path = os.path.join(self.base_path, "assets", filename)
+        image = pygame.image.load(path)
+        if size:
+            scaled_size = (int(size[0] * scale_factor),
+                           int(size[1] * scale_factor))
+            image = pygame.transform.scale(image, scaled_size)
+        return image
+
+    def store(self, cache_key, image):
+        """Convert a decoded image to display format and cache it"""
+        image = blit_ready(image)
+        self.cached_images[cache_key] = image
+        return image
+
     def load_image(self, filename, size=None):
         """Load and cache image assets"""
-        cache_key = f"{filename}_{size if size else 'original'}"
+        cache_key = (filename, size, 1)
 
         if cache_key in self.cached_images:
             return self.cached_images[cache_key]
 
+        baked = self.load_baked(cache_key)
+        if baked is not None:
+            return baked
+
         try:
+            return self.store(cache_key, self.decode(filename, size))
+        except pygame.error as e:
+            asset_log.error("Error loading image %s: %s", filename, e)
+            return None
+
+    def load_sprite(self, filename, fallback_color, size, scale_factor=1.3):
+        """Load, scale and cache a sprite, with a fallback color.
+
+        The sprite is scaled to `size` times `scale_factor`. If the file
+        is missing, a plain `size` surface filled with `fallback_color`
+        is cached instead.
+        """
+        cache_key = (filename, size, scale_factor)
+
+        if cache_key in self.cached_images:
+            return self.cached_images[cache_key]
+
+        baked = self.load_baked(cache_key)
+        if baked is not None:
+            return baked
+
+        try:
+            return self.store(
+                cache_key, self.decode(filename, size, scale_factor))
+        except FileNotFoundError:
             path = os.path.join(self.base_path, "assets", filename)
-            image = pygame.image.load(path).convert_alpha()
+            asset_log.warning("Missing sprite file at %s", path)
+            sprite = pygame.Surface((int(size[0] * scale_factor),
+                                     int(size[1] * scale_factor)))
+            sprite.fill(fallback_color)
 
-            if size:
-                image = pygame.transform.scale(image, size)
+        return self.store(cache_key, sprite)
 
-            self.cached_images[cache_key] = image
-            return image
-        except pygame.error as e:
-            print(f"Error loading image {filename}: {e}")
-            return None
+    def load_mask(self, filename, fallback_color, size, scale_factor=1.3):
+        """Return the cached collision mask of a load_sprite sprite.
+
+        Built once from the sprite's alpha, at the sprite's scaled size.
+        """
+        cache_key = (filename, size, scale_factor)
+        mask = self.cached_masks.get(cache_key)
+        if mask is None:
+            sprite = self.load_sprite(
+                filename, fallback_color, size, scale_factor)
+            mask = pygame.mask.from_surface(sprite)
+            self.cached_masks[cache_key] = mask
+        return mask
+
+    def warm_sprites(self, sprite_specs):
+        """Load a table of sprite specs into the cache ahead of time.
+
+        `sprite_specs` maps names to load_sprite argument tuples.
+        Returns a dict of name -> surface.
+        """
+        return {
+            name: self.load_sprite(*spec)
+            for name, spec in sprite_specs.items()
+        }
 
 
 class MusicManager:
-    def __init__(self, base_path):
+    """Plays looping music tracks from decoded Sounds, crossfading.
+
+    Tracks are decoded to PCM once and kept in memory, least recently
+    played first out, while they fit in `budget_bytes`. Decoding runs on
+    a background thread: play() on a track that is not decoded yet
+    starts it when update() sees the decode finish. Two reserved mixer
+    channels take turns, so the old track fades out while the new one
+    fades in.
+    """
+
+    def __init__(self, base_path, budget_bytes=32 * 2**20, fade_ms=600):
         self.base_path = base_path
         self.tracks = {
             'menu': "mission_start_whimsical_grand.ogg",
@@ -38,48 +177,216 @@ class MusicManager:
             'minigame': "ied_minigame_dangerzone.ogg",
             'gameover': "game_over_anchors_aweigh.ogg"
         }
+        self.budget_bytes = budget_bytes
+        self.fade_ms = fade_ms
         self.current_track = None
+        self.sounds = OrderedDict()  # Decoded Sounds, least recent first
+        self.sound_bytes = {}  # Decoded size of each cached Sound
+        self.used_bytes = 0
+        self.decoding = set()  # Tracks on the decode thread
+        self.decoded = queue.Queue()  # (track key, Sound or None)
+        self.pending = None  # (track key, volume) waiting on its decode
+        self.channels = None
+        self.active = 0  # Index of the channel playing current_track
+
+    def decode_track(self, track_key):
+        """Decode a track to a Sound. Safe to call from any thread."""
+        track_path = os.path.join(
+            self.base_path, "assets", self.tracks[track_key])
+        return pygame.mixer.Sound(track_path)
+
+    def store_track(self, track_key, sound):
+        """Cache a decoded track, evicting older ones over the budget"""
+        if track_key in self.sounds:
+            return
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        size = int(sound.get_length() * frequency * channels
+                   * abs(sample_format) // 8)
+        self.sounds[track_key] = sound
+        self.sound_bytes[track_key] = size
+        self.used_bytes += size
+        for old_key in list(self.sounds):
+            if self.used_bytes <= self.budget_bytes:
+                break
+            if old_key in (track_key, self.current_track):
+                continue
+            # A channel still fading this track out keeps its own reference
+            del self.sounds[old_key]
+            self.used_bytes -= self.sound_bytes.pop(old_key)
+
+    def request(self, track_key):
+        """Start decoding a track in the background if it is not cached"""
+        if track_key in self.sounds or track_key in self.decoding:
+            return
+        self.decoding.add(track_key)
+        threading.Thread(target=self._decode, args=(track_key,),
+                         name="music-decode", daemon=True).start()
+
+    def _decode(self, track_key):
+        try:
+            sound = self.decode_track(track_key)
+        except pygame.error as e:
+            music_log.error("Error decoding music track %s: %s",
+                            track_key, e)
+            sound = None
+        self.decoded.put((track_key, sound))
+
+    def update(self):
+        """Cache finished decodes and start a track that was waiting"""
+        while True:
+            try:
+                track_key, sound = self.decoded.get_nowait()
+            except queue.Empty:
+                break
+            self.decoding.discard(track_key)
+            if sound is not None:
+                self.store_track(track_key, sound)
+        if self.pending is not None and self.pending[0] in self.sounds:
+            track_key, volume = self.pending
+            self.pending = None
+            self.play(track_key, volume)
 
     def play(self, track_key, volume=0.5):
-        """Play a music track"""
+        """Crossfade to a music track, once it is decoded"""
         if track_key not in self.tracks:
             return False
 
         try:
-            if (
-                self.current_track == track_key
-                and pygame.mixer.music.get_busy()
-            ):
+            if self.channels is None:
+                pygame.mixer.set_reserved(2)
+                self.channels = [pygame.mixer.Channel(0),
+                                 pygame.mixer.Channel(1)]
+            channel = self.channels[self.active]
+            if self.current_track == track_key and channel.get_busy():
+                self.pending = None
+                channel.set_volume(volume)
                 return True
 
-            pygame.mixer.music.stop()
-            pygame.mixer.music.unload()
+            sound = self.sounds.get(track_key)
+            if sound is None:
+                self.pending = (track_key, volume)
+                self.request(track_key)
+                return True
+            self.sounds.move_to_end(track_key)
+            self.pending = None
 
-            track_path = os.path.join(
-                self.base_path, "assets", self.tracks[track_key])
-            pygame.mixer.music.load(track_path)
-            pygame.mixer.music.set_volume(volume)
-            pygame.mixer.music.play(-1)
+            if channel.get_busy():
+                channel.fadeout(self.fade_ms)
+                self.active = 1 - self.active
+                channel = self.channels[self.active]
+            channel.set_volume(volume)
+            channel.play(sound, loops=-1, fade_ms=self.fade_ms)
 
             self.current_track = track_key
             return True
         except pygame.error as e:
-            print(f"Error playing music track {track_key}: {e}")
+            music_log.error("Error playing music track %s: %s", track_key, e)
             return False
 
 
 class FontManager:
-    def __init__(self):
+    """Creates and caches every font the game uses.
+
+    Fonts are cached in memory by (name, size, bold). Looking a system
+    font up by name scans the installed fonts (fc-list on Linux), so the
+    resolved file paths are also kept in an on-disk cache, and a TTF
+    bundled as assets/BUNDLED_FONT is used instead of system fonts
+    altogether. Sizes are multiplied by `scale`, for screens drawn at a
+    reduced render resolution.
+    """
+
+    FONT_NAME = "consolas"
+    BUNDLED_FONT = "font.ttf"
+    CACHE_FILENAME = "font_cache.json"
+
+    def __init__(self, base_path=None, scale=1.0):
+        self.base_path = base_path
+        self.scale = scale
         self.fonts = {}
+        self.loaded = {}  # (name, size, bold) -> pygame.font.Font
+        self.bundled_path = None
+        self.cache_path = None
+        self.resolved = {}  # "name|bold" -> font file path or None
+        if base_path is not None:
+            bundled_path = os.path.join(
+                base_path, "assets", self.BUNDLED_FONT)
+            if os.path.exists(bundled_path):
+                self.bundled_path = bundled_path
+            self.cache_path = os.path.join(
+                base_path, "assets", self.CACHE_FILENAME)
+            self.resolved = self.read_cache()
         self.setup_fonts()
 
+    def read_cache(self):
+        """Return the on-disk path cache, or {} if missing or unreadable"""
+        try:
+            with open(self.cache_path) as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    def write_cache(self):
+        try:
+            with open(self.cache_path, "w") as cache_file:
+                json.dump(self.resolved, cache_file, indent=2,
+                          sort_keys=True)
+        except OSError as e:
+            font_log.warning("Could not write font cache %s: %s",
+                             self.cache_path, e)
+
+    def resolve(self, name, bold=False):
+        """Return the font file for a system font name, or None.
+
+        None means pygame's default font. Results are cached on disk, so
+        installed fonts are only scanned once per name and weight.
+        """
+        key = f"{name}|{'bold' if bold else 'regular'}"
+        path = self.resolved.get(key)
+        if key in self.resolved and (path is None or os.path.exists(path)):
+            return path
+
+        path = pygame.font.match_font(name, bold=bold)
+        font_log.info("Resolved font %s to %s", key, path)
+        self.resolved[key] = path
+        if self.cache_path is not None:
+            self.write_cache()
+        return path
+
+    def font(self, size, bold=False, name=None):
+        """Return a cached font; the bundled font is used if present"""
+        name = name or self.FONT_NAME
+        cache_key = (name, size, bold)
+        font = self.loaded.get(cache_key)
+        if font is not None:
+            return font
+
+        if self.bundled_path is not None:
+            path = self.bundled_path
+            synthetic_bold = bold
+        else:
+            path = self.resolve(name, bold)
+            # Embolden the regular face if there is no separate bold one
+            synthetic_bold = bold and (
+                path is None or path == self.resolve(name))
+        font = pygame.font.Font(path, max(1, round(size * self.scale)))
+        if synthetic_bold:
+            font.set_bold(True)
+        self.loaded[cache_key] = font
+        return font
+
+    def scaled(self, scale):
+        """Return a FontManager for the same fonts with sizes scaled"""
+        if scale == self.scale:
+            return self
+        return FontManager(self.base_path, scale)
+
     def setup_fonts(self):
         """Initialize common fonts"""
         self.fonts.update({
-            'regular': pygame.font.SysFont("consolas", 28),
-            'small': pygame.font.SysFont("consolas", 20),
-            'large': pygame.font.SysFont("consolas", 40, bold=True),
-            'title': pygame.font.SysFont("consolas", 80, bold=True)
+            'regular': self.font(28),
+            'small': self.font(20),
+            'large': self.font(40, bold=True),
+            'title': self.font(80, bold=True)
         })
 
     def get_font(self, font_key):
@@ -87,7 +394,88 @@ class FontManager:
         return self.fonts.get(font_key)
 
 
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces.
+
+    Keyed by (font, text, color, antialias), so unchanged strings are
+    rasterized once and then only blitted. Returned surfaces are shared
+    and must not be drawn on.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Return font.render(text, antialias, color), cached"""
+        key = (font, text, tuple(color), antialias)
+        rendered = self.entries.get(key)
+        if rendered is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return rendered
+
+        self.misses += 1
+        rendered = font.render(text, antialias, color)
+        self.entries[key] = rendered
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)  # Drop least recently used
+        return rendered
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Shared by draw_text and the minigame HUD
+text_cache = TextCache()
+
+
+def present_scaled(frame, display, rects=None):
+    """Upscale a low-resolution frame onto the display surface.
+
+    Scales the whole frame, or only `rects` of it, with nearest-neighbour
+    sampling and returns the display rects written. Whole-number scale
+    factors keep every source pixel the same size.
+    """
+    frame_width, frame_height = frame.get_size()
+    display_width, display_height = display.get_size()
+    if rects is None:
+        pygame.transform.scale(frame, (display_width, display_height),
+                               display)
+        return [display.get_rect()]
+
+    # Rects are widened to whole blocks of frame pixels that map onto
+    # whole display pixels (3x3 -> 4x4 at scale 0.75), so each one samples
+    # the same source pixels as scaling the whole frame would
+    unit_x = frame_width // math.gcd(frame_width, display_width)
+    unit_y = frame_height // math.gcd(frame_height, display_height)
+    frame_rect = frame.get_rect()
+    scaled = []
+    for rect in rects:
+        rect = frame_rect.clip(rect)
+        if not rect.width or not rect.height:
+            continue
+        left = rect.left // unit_x * unit_x
+        top = rect.top // unit_y * unit_y
+        right = -(-rect.right // unit_x) * unit_x
+        bottom = -(-rect.bottom // unit_y) * unit_y
+        rect = pygame.Rect(left, top, right - left, bottom - top)
+        target = pygame.Rect(
+            left * display_width // frame_width,
+            top * display_height // frame_height,
+            rect.width * display_width // frame_width,
+            rect.height * display_height // frame_height)
+        pygame.transform.scale(frame.subsurface(rect), target.size,
+                               display.subsurface(target))
+        scaled.append(target)
+    return scaled
+
+
 def draw_text(surface, text, font, color, x, y):
     """Helper function to draw text"""
-    rendered = font.render(text, True, color)
-    surface.blit(rendered, (x - rendered.get_width()//2, y))
+    rendered = text_cache.render(font, text, color)
+    return surface.blit(rendered, (x - rendered.get_width()//2, y))
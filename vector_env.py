@@ -0,0 +1,229 @@
+"""Batched reset()/step() interface over N independent minigame rounds.
+
+VectorMinigameEnv plays the same rules as MinigameSim, but keeps every
+game's player, IED, battery and obstacles in NumPy arrays and advances
+all of them with one set of array operations per step. Actions are the
+per-step input bitmasks (minigame_sim.INPUT_LEFT etc.).
+
+Random numbers come from a numpy Generator, so a game here will not
+match a MinigameSim seeded with the same value move for move, but the
+rules and their statistics are the same.
+"""
+import random
+
+import numpy as np
+
+from hit_masks import table_hits
+from minigame_sim import (
+    MinigameSim, INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN,
+)
+
+
+class VectorMinigameEnv:
+    """N minigame rounds stepped together; finished rounds restart.
+
+    step() returns (observation, rewards, dones, info). A game that ends
+    gets reward 1 for finding the IED and -1 otherwise, and is reset
+    before step() returns. `info` holds each game's `success`, `steps`
+    and `battery` at the end of the step, before any reset.
+    """
+
+    def __init__(self, num_games, width=1024, height=768, seed=None,
+                 difficulty='normal', tuning=None, initial_battery=100,
+                 operator_mode=False, capacity=32, hit_masks=None):
+        # Take the rules' constants, tuning and hit masks from the scalar
+        # sim
+        rules = MinigameSim(width, height, operator_mode=operator_mode,
+                            rng=random.Random(0), difficulty=difficulty,
+                            tuning=tuning, hit_masks=hit_masks)
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self.player_size = rules.PLAYER_SIZE
+        self.ied_size = rules.IED_SIZE
+        self.obstacle_size = rules.OBSTACLE_SIZE
+        self.hit_masks = rules.hit_masks
+        self.fall_speed = rules.FALL_SPEED
+        self.move_speed = rules.MOVE_SPEED
+        self.battery_drain = rules.BATTERY_DRAIN
+        self.spawn_chance = rules.spawn_chance
+        self.spawn_count = rules.spawn_count
+        self.ied_min_distance = rules.IED_MIN_DISTANCE
+        self.operator_mode = rules.operator_mode
+        self.initial_battery = initial_battery
+        self.start_pos = rules.player_pos
+
+        self.rng = np.random.default_rng(seed)
+        self.games = np.arange(num_games)
+        self.player = np.zeros((num_games, 2))
+        self.ied = np.zeros((num_games, 2))
+        self.battery = np.zeros(num_games)
+        self.steps = np.zeros(num_games, dtype=np.int64)
+
+        # Obstacles: one row of slots per game; `alive` marks used slots
+        self.obstacle_x = np.zeros((num_games, capacity))
+        self.obstacle_y = np.zeros((num_games, capacity))
+        self.obstacle_kind = np.zeros((num_games, capacity), dtype=np.uint8)
+        self.alive = np.zeros((num_games, capacity), dtype=np.bool_)
+        self.reset()
+
+    def reset(self):
+        """Start every game afresh and return the observation"""
+        self._reset_games(self.games)
+        return self.observation()
+
+    def observation(self):
+        """Return copies of each game's state, keyed by name"""
+        return {
+            'player': self.player.copy(),
+            'ied': self.ied.copy(),
+            'battery': self.battery.copy(),
+            'obstacle_x': self.obstacle_x.copy(),
+            'obstacle_y': self.obstacle_y.copy(),
+            'obstacle_alive': self.alive.copy(),
+        }
+
+    def _reset_games(self, games):
+        self.player[games] = self.start_pos
+        self.battery[games] = self.initial_battery
+        self.steps[games] = 0
+        self.alive[games] = False
+        self._place_ied(games)
+
+    def _place_ied(self, games):
+        """Place IEDs at least ied_min_distance from the players"""
+        pending = games
+        while pending.size:
+            x = self.rng.integers(
+                0, self.width - self.ied_size, size=pending.size,
+                endpoint=True)
+            y = self.rng.integers(
+                0, self.height - self.ied_size, size=pending.size,
+                endpoint=True)
+            distance = np.hypot(x - self.player[pending, 0],
+                                y - self.player[pending, 1])
+            placed = distance >= self.ied_min_distance
+            self.ied[pending[placed], 0] = x[placed]
+            self.ied[pending[placed], 1] = y[placed]
+            pending = pending[~placed]
+
+    def _ied_found(self):
+        """Return which players' sprites touch their IED.
+
+        Same test as HitMasks.ied_hit: the player's bounds against the
+        IED's box, then the hit table at the whole-pixel offset.
+        """
+        masks = self.hit_masks
+        bounds_x, bounds_y, width, height = masks.player_bounds
+        ied_width, ied_height = masks.ied_size
+        x = self.player[:, 0] + bounds_x
+        y = self.player[:, 1] + bounds_y
+        ied_x = self.ied[:, 0]
+        ied_y = self.ied[:, 1]
+        near = ((x < ied_x + ied_width) & (ied_x < x + width)
+                & (y < ied_y + ied_height) & (ied_y < y + height))
+        dx = self.ied.astype(np.int64) - self.player.astype(np.int64)
+        return near & table_hits(masks.ied_table, masks.ied,
+                                 dx[:, 0], dx[:, 1])
+
+    def _obstacle_hit(self):
+        """Return which players' sprites touch any of their obstacles"""
+        masks = self.hit_masks
+        bounds_x, bounds_y, width, height = masks.player_bounds
+        size = masks.obstacle_size
+        x = self.player[:, 0:1] + bounds_x
+        y = self.player[:, 1:2] + bounds_y
+        ox = self.obstacle_x
+        oy = self.obstacle_y
+        near = (self.alive & (ox < x + width) & (x < ox + size)
+                & (oy < y + height) & (y < oy + size))
+        games, slots = np.nonzero(near)
+        dx = (ox[games, slots].astype(np.int64)
+              - self.player[games, 0].astype(np.int64))
+        dy = (oy[games, slots].astype(np.int64)
+              - self.player[games, 1].astype(np.int64))
+        kinds = self.obstacle_kind[games, slots]
+        touching = np.zeros(games.size, dtype=np.bool_)
+        for kind, (table, mask) in enumerate(
+                zip(masks.obstacle_tables, masks.obstacles)):
+            of_kind = kinds == kind
+            touching[of_kind] = table_hits(
+                table, mask, dx[of_kind], dy[of_kind])
+        hit = np.zeros(self.num_games, dtype=np.bool_)
+        hit[games[touching]] = True
+        return hit
+
+    def _grow(self):
+        """Double the obstacle slots per game"""
+        for name in ('obstacle_x', 'obstacle_y', 'obstacle_kind', 'alive'):
+            old = getattr(self, name)
+            grown = np.zeros((old.shape[0], old.shape[1] * 2),
+                             dtype=old.dtype)
+            grown[:, :old.shape[1]] = old
+            setattr(self, name, grown)
+
+    def _spawn(self, games):
+        """Spawn one obstacle at the top of the screen in each game"""
+        free = ~self.alive[games]
+        if not free.any(axis=1).all():
+            self._grow()
+            free = ~self.alive[games]
+        slots = np.argmax(free, axis=1)
+        size = self.obstacle_size
+        self.obstacle_x[games, slots] = self.rng.integers(
+            0, self.width - size, size=games.size, endpoint=True)
+        self.obstacle_y[games, slots] = -size
+        if self.operator_mode:
+            self.obstacle_kind[games, slots] = self.rng.integers(
+                0, 2, size=games.size)
+        self.alive[games, slots] = True
+
+    def step(self, actions):
+        """Advance every game one sim step with INPUT_* bitmask actions"""
+        actions = np.asarray(actions)
+        dx = ((actions & INPUT_RIGHT) != 0).astype(np.int8) - \
+            ((actions & INPUT_LEFT) != 0)
+        dy = ((actions & INPUT_DOWN) != 0).astype(np.int8) - \
+            ((actions & INPUT_UP) != 0)
+
+        # MinigameSim.move_player: moves that stay on screen go ahead
+        new_x = self.player[:, 0] + dx * self.move_speed
+        new_y = self.player[:, 1] + dy * self.move_speed
+        moved = ((dx != 0) | (dy != 0)) & (0 <= new_x) & \
+            (new_x < self.width - self.player_size) & (0 <= new_y) & \
+            (new_y < self.height - self.player_size)
+        self.player[moved, 0] = new_x[moved]
+        self.player[moved, 1] = new_y[moved]
+
+        # Finding the IED (after moving, or at the start of update) wins;
+        # moving into an obstacle loses
+        success = self._ied_found()
+        failed = moved & ~success & self._obstacle_hit()
+        active = ~(success | failed)
+
+        # MinigameSim.update for the games still going
+        self.obstacle_y[active] += self.fall_speed
+        self.alive[active] &= self.obstacle_y[active] <= self.height
+        rolls = self.rng.integers(1, self.spawn_chance, size=self.num_games,
+                                  endpoint=True)
+        spawning = self.games[active & (rolls == 1)]
+        for _ in range(self.spawn_count):
+            if spawning.size:
+                self._spawn(spawning)
+
+        hit = active & self._obstacle_hit()
+        draining = active & ~hit
+        self.battery[draining] -= self.battery_drain
+        failed |= hit | (draining & (self.battery <= 0))
+        self.steps += 1
+
+        dones = success | failed
+        rewards = success.astype(np.float64) - failed
+        info = {
+            'success': success,
+            'steps': self.steps.copy(),
+            'battery': self.battery.copy(),
+        }
+        if dones.any():
+            self._reset_games(self.games[dones])
+        return self.observation(), rewards, dones, info